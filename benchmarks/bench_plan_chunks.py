@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: plan_chunks
+
+Compares the previous chunk planner (clauses split on 。、！？!? only, hard
+split at max_length) with the bounded planner that also breaks on
+newlines, ASCII sentence ends and commas, on long narration texts.
+The planner's guarantees are checked in tests/test_plan_chunks.py.
+
+Usage:
+    python benchmarks/bench_plan_chunks.py [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import claude_aivis_aloud as aloud  # noqa: E402
+
+_CLAUSE_SPLIT_RE = re.compile(r'(。。|[。、！？!?])')
+
+
+def _clause_units(text):
+    parts = _CLAUSE_SPLIT_RE.split(text)
+    units = [parts[i] + parts[i + 1] for i in range(0, len(parts) - 1, 2)]
+    if parts[-1]:
+        units.append(parts[-1])
+    return [u for u in units if u.strip()]
+
+
+def previous_plan_chunks(text, first_length=aloud.FIRST_CHUNK_MAX_LENGTH,
+                         max_length=aloud.AIVIS_OPTIMAL_LENGTH):
+    """Chunk planner before the bounded break rules, kept for comparison"""
+    if len(text) <= max(aloud.CHUNK_PLAN_MIN_LENGTH, first_length):
+        return [text]
+    growth = aloud.CHUNK_GROWTH_DEFAULT
+    chunks = []
+    current = []
+    current_len = 0
+    budget = first_length
+
+    def emit():
+        nonlocal current, current_len, budget
+        chunks.append(''.join(current))
+        current = []
+        current_len = 0
+        budget = min(max_length, int(budget * growth))
+
+    for unit in _clause_units(text):
+        if current and current_len + len(unit) > budget:
+            emit()
+        if len(unit) > max_length:
+            for i in range(0, len(unit), max_length):
+                current.append(unit[i:i + max_length])
+                current_len += len(current[-1])
+                if current_len >= max_length:
+                    emit()
+            continue
+        current.append(unit)
+        current_len += len(unit)
+    if current:
+        chunks.append(''.join(current))
+    return chunks
+
+
+def bench(label, func, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    per_text = best / len(texts) * 1000
+    print(f"  {label:<10} {per_text:8.3f} ms/text")
+    return per_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Unmemoized, at the default growth
+    def plan_chunks(text):
+        return aloud._plan_chunks.__wrapped__(text, aloud.FIRST_CHUNK_MAX_LENGTH,
+                                              aloud.AIVIS_OPTIMAL_LENGTH, aloud.CHUNK_GROWTH_DEFAULT)
+
+    # Texts the previous planner only hard-split mid-word
+    for label, text in [('newlines', 'line of output\n' * 200),
+                        ('English', 'The build passed. All tests are green. ' * 100),
+                        ('commas', 'an item, ' * 300 + '。')]:
+        old = previous_plan_chunks(text)
+        new = plan_chunks(text)
+        old_mid = sum(1 for c in old[:-1] if not c.rstrip().endswith(('\n', '.', ',', '、', '。')))
+        new_mid = sum(1 for c in new[:-1] if not c.rstrip().endswith(('.', ',', '、', '。')) and not c.endswith('\n'))
+        print(f"{label}: chunks cut mid-word: previous {old_mid}/{len(old)}, new {new_mid}/{len(new)}")
+
+    sentence = '設定ファイルを読み込んで、エンジンの状態を確認しました。'
+    for sentences in (10, 100, 1000):
+        texts = [sentence * sentences + '\n\n' + sentence * sentences for _ in range(10)]
+        print(f"{len(texts[0])} chars/text")
+        old = bench('previous', previous_plan_chunks, texts, args.repeat)
+        new = bench('new', plan_chunks, texts, args.repeat)
+        print(f"  speedup    {old / new:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: term dictionary replacement in the narration normalizer
+
+Compares the previous per-term approach (one IGNORECASE regex pass per
+dictionary entry) with NarrationNormalizer's single scan over ASCII letter
+runs, on long assistant messages. Both must produce identical output.
+
+Usage:
+    python benchmarks/bench_term_replacement.py [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import claude_aivis_aloud as aloud  # noqa: E402
+
+
+def per_term_replace(text, table):
+    """Previous implementation: one regex pass per dictionary entry"""
+    for old, new in table.items():
+        text = re.sub(rf'(?<![a-zA-Z]){old}(?![a-zA-Z])', new, text, flags=re.IGNORECASE)
+    return text
+
+
+def make_message(rng, sentences):
+    """A long assistant message mixing Japanese prose and English terms"""
+    terms = list(aloud._TERM_REPLACEMENTS) + list(aloud._EARLY_TERM_REPLACEMENTS)
+    prose = ['設定を確認しました', 'この変更で問題が解決します', '次に', '結果は以下の通りです',
+             'テストを追加しました', '念のため', 'ログを見ると']
+    parts = []
+    for _ in range(sentences):
+        words = [rng.choice(prose)]
+        for _ in range(rng.randint(1, 4)):
+            term = rng.choice(terms)
+            words.append(rng.choice([term, term.upper(), term.capitalize(), 'unknownword']))
+        parts.append('の'.join(words) + '。')
+    return '\n'.join(parts)
+
+
+def bench(label, func, messages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    per_message = best / len(messages) * 1000
+    print(f"  {label:<12} {per_message:8.3f} ms/message")
+    return per_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    normalizer = aloud.NarrationNormalizer()
+    tables = [('early', aloud._EARLY_TERM_REPLACEMENTS, normalizer._early_terms),
+              ('late', aloud._TERM_REPLACEMENTS, normalizer._terms)]
+
+    for sentences in (10, 100, 1000):
+        messages = [make_message(rng, sentences) for _ in range(20)]
+        chars = sum(map(len, messages)) // len(messages)
+        print(f"{sentences} sentences (~{chars} chars/message)")
+        for name, table, compiled in tables:
+            for message in messages:
+                assert per_term_replace(message, table) == normalizer._replace_terms(message, compiled)
+            print(f" {name} dictionary ({len(table)} terms)")
+            old = bench('per-term', lambda m: per_term_replace(m, table), messages, args.repeat)
+            new = bench('single-scan', lambda m: normalizer._replace_terms(m, compiled),
+                        messages, args.repeat)
+            print(f"  speedup      {old / new:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: raw-bytes prefilter for transcript lines
+
+Feeds a synthetic transcript (assistant text and tool calls, tool results of
+various sizes, queue operations, summaries, file history snapshots, system
+records) through process_transcript_line with and without the prefilter.
+Both runs must enqueue exactly the same narration.
+
+Usage:
+    python benchmarks/bench_transcript_prefilter.py [--repeat N] [--lines N]
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import claude_aivis_aloud as aloud  # noqa: E402
+
+
+def make_record(rng, i):
+    """One transcript record, roughly in the proportions of a coding session"""
+    ts = f"2026-01-01T00:00:{i:06d}Z"
+    kind = rng.choices(
+        ['assistant_text', 'assistant_tool', 'tool_result', 'tool_denied', 'user_text',
+         'enqueue', 'dequeue', 'summary', 'snapshot', 'system'],
+        weights=[10, 15, 30, 1, 3, 3, 3, 2, 10, 5])[0]
+    if kind == 'assistant_text':
+        content = [{'type': 'text', 'text': f'設定を確認しました。{i}番目の変更です。'}]
+        return {'type': 'assistant', 'timestamp': ts, 'message': {'role': 'assistant', 'content': content}}
+    if kind == 'assistant_tool':
+        content = [{'type': 'tool_use', 'id': f'toolu_{i}', 'name': 'Read',
+                    'input': {'file_path': f'/src/module_{i}.py'}}]
+        return {'type': 'assistant', 'timestamp': ts, 'message': {'role': 'assistant', 'content': content}}
+    if kind in ('tool_result', 'tool_denied'):
+        if kind == 'tool_denied':
+            output = "The user doesn't want to proceed with this tool use."
+        else:
+            output = '\n'.join(f'{n:>6}\tline {n} of some file' for n in range(rng.choice([5, 50, 500, 5000])))
+        content = [{'type': 'tool_result', 'tool_use_id': f'toolu_{i}', 'content': output}]
+        return {'type': 'user', 'timestamp': ts, 'toolUseResult': {'stdout': output},
+                'message': {'role': 'user', 'content': content}}
+    if kind == 'user_text':
+        return {'type': 'user', 'timestamp': ts, 'message': {'role': 'user', 'content': f'次の作業{i}'}}
+    if kind in ('enqueue', 'dequeue'):
+        return {'type': 'queue-operation', 'operation': kind, 'timestamp': ts, 'content': f'次の作業{i}'}
+    if kind == 'summary':
+        return {'type': 'summary', 'summary': f'Session summary {i}', 'leafUuid': f'uuid-{i}'}
+    if kind == 'snapshot':
+        files = {f'/src/module_{n}.py': {'backupFileName': f'{n}@v1', 'version': 1} for n in range(40)}
+        return {'type': 'file-history-snapshot', 'messageId': f'm{i}', 'snapshot': {'trackedFileBackups': files}}
+    return {'type': 'system', 'subtype': 'informational', 'timestamp': ts, 'content': 'Hook completed'}
+
+
+def run(lines, prefilter):
+    """Process every line; return the narration enqueued"""
+    spoken = []
+    aloud.enqueue_speech_simple = lambda text, **kwargs: spoken.append(text)
+    aloud.is_narratable_line = prefilter
+    aloud._processed_messages.clear()
+    for line in lines:
+        try:
+            aloud.process_transcript_line(line)
+        except json.JSONDecodeError:
+            pass
+    return spoken
+
+
+def bench(label, lines, prefilter, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(lines, prefilter)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<14} {best * 1000:9.1f} ms  ({best / len(lines) * 1e6:7.1f} us/line)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--lines', type=int, default=5000)
+    args = parser.parse_args()
+
+    aloud.logger.setLevel(logging.WARNING)
+    rng = random.Random(0)
+    lines = [json.dumps(make_record(rng, i), ensure_ascii=False).encode('utf-8')
+             for i in range(args.lines)]
+    prefilter = aloud.is_narratable_line
+    parse_all = lambda raw_line: True  # noqa: E731
+
+    expected = run(lines, parse_all)
+    assert run(lines, prefilter) == expected
+    parsed = sum(1 for line in lines if prefilter(line))
+    size = sum(map(len, lines))
+    print(f"{len(lines)} lines, {size / 1e6:.1f} MB, {parsed} pass the prefilter, "
+          f"{len(expected)} narrations")
+
+    old = bench('parse all', lines, parse_all, args.repeat)
+    new = bench('prefiltered', lines, prefilter, args.repeat)
+    print(f"  speedup        {old / new:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
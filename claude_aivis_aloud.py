@@ -9,26 +9,44 @@ Claude Code Desktop support with full Japanese narration
 Based on v3.2.3
 """
 
+import argparse
 import json
 import time
 import re
+import reprlib
 import os
 import sys
 import logging
 import codecs
-from glob import glob
 from pathlib import Path
 from datetime import datetime
-from collections import deque
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from itertools import islice
+import functools
 import hashlib
+import mmap
+import struct
+import zlib
+import zipfile
 import threading
 import queue
 import subprocess
 import signal
 import atexit
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import pygame
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # Optional: transcript tailing falls back to stat polling
+    Observer = None
+    FileSystemEventHandler = object
 
 # Windows environment UTF-8 force settings
 if sys.platform == 'win32':
@@ -51,6 +69,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger('claude_aivis')
 
+# ===============================
+# Configuration (config.json)
+# ===============================
+CONFIG_PATH = Path(__file__).parent / "config.json"
+
+def load_config(path=CONFIG_PATH):
+    """Load config.json next to the script; missing or invalid files yield {}"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return config if isinstance(config, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"[Config] Could not read {path}: {e}")
+        return {}
+
+_config = load_config()
+_engine_config = _config.get('engine', {})
+
+def _engine_url(host, port):
+    if host == 'localhost':
+        host = '127.0.0.1'  # Skip IPv6 lookup delays on Windows
+    return f"http://{host}:{port}"
+
+def _engine_base_url():
+    return _engine_url(_engine_config.get('host', '127.0.0.1'), _engine_config.get('port', 10101))
+
+def _engine_endpoint_urls():
+    """
+    Engine URLs from engine.endpoints (v4.2), falling back to host/port.
+    Entries may be "http://host:port", "host:port" or {"host": ..., "port": ...}.
+    """
+    urls = []
+    for endpoint in _engine_config.get('endpoints') or []:
+        if isinstance(endpoint, dict):
+            urls.append(_engine_url(endpoint.get('host', '127.0.0.1'), endpoint.get('port', 10101)))
+        elif isinstance(endpoint, str) and endpoint.startswith(('http://', 'https://')):
+            urls.append(endpoint.rstrip('/'))
+        elif isinstance(endpoint, str) and ':' in endpoint:
+            host, port = endpoint.rsplit(':', 1)
+            urls.append(_engine_url(host, port))
+        else:
+            logger.warning(f"[Config] Ignoring engine endpoint: {endpoint!r}")
+    return urls or [_engine_base_url()]
+
+
 # ===============================
 # Global variables and settings
 # ===============================
@@ -63,23 +128,82 @@ _max_runtime = 3600 * 24  # 24 hours max runtime
 _start_time = None
 
 # AivisSpeech Engine settings
-AIVIS_BASE_URL = "http://127.0.0.1:10101"
+AIVIS_ENGINE_URLS = _engine_endpoint_urls()  # v4.2: From the engine section of config.json
+AIVIS_BASE_URL = AIVIS_ENGINE_URLS[0]
 AIVIS_SPEAKER_ID = 1325133120
+# v4.2: Other style IDs in use, warmed up together with AIVIS_SPEAKER_ID
+AIVIS_EXTRA_SPEAKER_IDS = _config.get('voice', {}).get('extra_speaker_ids', [])
+SPEAKER_WARMUP_TIMEOUT = 120.0  # Longest wait for model loading before the phrase bank starts
 AIVIS_MAX_LENGTH = 500
 AIVIS_OPTIMAL_LENGTH = 300
+ENGINE_CONNECT_TIMEOUT = 3.05  # seconds (read timeout comes from config.json)
+ENGINE_PROBE_TIMEOUT = 1.0  # seconds for a /version health probe
+ENGINE_BREAKER_THRESHOLD = 2  # Consecutive failures that open an engine's circuit
+ENGINE_BREAKER_BASE_BACKOFF = 0.5  # First health probe delay after opening (seconds)
+ENGINE_BREAKER_MAX_BACKOFF = 2.0  # Probe interval cap while an engine stays down
+ENGINE_RETRY_BACKOFF = 0.2  # seconds before the first retry on the same engine (doubles)
+ENGINE_RETRY_BUDGET_RATIO = 0.1  # Retry tokens earned per successful call (cap: retry_count)
+ENGINE_INITIAL_LATENCY = 0.5  # seconds assumed before an engine's latency is measured
+ENGINE_LATENCY_EWMA_ALPHA = 0.3  # Weight of the newest sample in the latency EWMA
 
 # Narration speed settings for natural reading
 NARRATION_SPEED_NORMAL = 1.0  # 通常朗読
 NARRATION_SPEED_THINKING = 1.1  # 思考部分は少し速め
 NARRATION_PAUSE_SENTENCE = 0.5  # 文末の間
 NARRATION_PAUSE_PARAGRAPH = 0.8  # 段落間の間
+NARRATION_PAUSE_CLAUSE = 0.15  # 読点で区切ったチャンク間の間
+
+# Synthesis pipeline settings (v4.2)
+SYNTHESIS_LOOKAHEAD = 2  # Chunks synthesized ahead of the one currently playing
+MULTI_SYNTHESIS_ENABLED = True  # Batch later chunks of a long message via /multi_synthesis
+MULTI_SYNTHESIS_MAX_BATCH = 4  # Chunks per /multi_synthesis request
+FIRST_CHUNK_MAX_LENGTH = 40  # First chunk of a message: about one clause, for fast first audio
+CHUNK_PLAN_MIN_LENGTH = 80  # Texts up to this length are synthesized as a single chunk
+CHUNK_GROWTH_MIN = 1.5  # Bounds on how fast later chunks grow (from 1 / real-time factor)
+CHUNK_GROWTH_MAX = 4.0
+CHUNK_GROWTH_DEFAULT = 2.0  # Used until the engine's real-time factor has been measured
+ASYNC_MAX_CONCURRENCY = 4  # Concurrent engine requests per endpoint (async pipeline)
+STREAMING_PLAYBACK = True  # Start playing chunks that were not prefetched while they download
+STREAM_BLOCK_SECONDS = 0.25  # Audio per Sound slice queued on the channel while streaming
+STREAM_READ_SIZE = 16 * 1024  # Bytes per read from the /synthesis response
+# While the engine is down, queued speech is held instead of dropped, up to:
+SPEECH_STALE_SECONDS = 120.0  # 通常の応答 (seconds since enqueue)
+SPEECH_STALE_SECONDS_LOW = 15.0  # 思考・ツール (low-priority)
+AUDIO_CACHE_MAX_BYTES = 64 * 1024 * 1024  # In-memory WAV cache budget (~20 min of 24kHz audio)
+AUDIO_QUERY_CACHE_MAX_BYTES = 8 * 1024 * 1024  # In-memory AudioQuery JSON cache budget
+NARRATION_MEMO_MAX_BYTES = 2 * 1024 * 1024  # Per memoized text function (normalize/split)
+AUDIO_STORE_DIR = Path.home() / '.claude' / 'aivis_audio_cache'  # Persistent pack file + index
+AUDIO_STORE_MAX_BYTES = 256 * 1024 * 1024  # Size cap for live entries on disk
+AUDIO_STORE_COMPACT_MIN_DEAD = 16 * 1024 * 1024  # Compact once this much dead space accumulates
+AUDIO_STORE_INDEX_FLUSH_SECONDS = 5.0  # Minimum interval between index rewrites
+
+# Audio output format (v4.2)
+# "sample_rate": "auto" uses the engine's native rate (/engine_manifest)
+_audio_config = _config.get('audio', {})
+AUDIO_SAMPLE_RATE = _audio_config.get('sample_rate', 24000)
+AUDIO_CHANNELS = _audio_config.get('channels', 1)
+AUDIO_BUFFER_SIZE = _audio_config.get('buffer_size', 512)
+AUDIO_FALLBACK_SAMPLE_RATE = 24000  # When neither config nor engine gives a rate
 
 # Volume settings for differentiation (v4.0)
 VOLUME_NORMAL = 0.3  # 通常の応答の音量
 VOLUME_THINKING = 0.1  # Thinking・ツール部分の音量
 
+# Speech pipeline: 'thread' (speech_worker_simple) or 'async' (speech_worker_async)
+# Overridden by the --pipeline command line option
+PIPELINE_MODE = 'async' if _config.get('features', {}).get('async_pipeline') else 'thread'
+
 # Dynamic file switching settings
-CHECK_INTERVAL = 10  # seconds (new session check interval)
+CHECK_INTERVAL = 10  # seconds (full session index sweep interval)
+SESSION_SCAN_INTERVAL = 0.5  # seconds (v4.2: project directory mtime check for new sessions)
+
+# Transcript tailing (v4.2): watchdog events, else stat polling with idle backoff
+TAIL_USE_WATCHDOG = True
+TAIL_POLL_MIN_INTERVAL = 0.01  # seconds between stat polls right after a change
+TAIL_POLL_MAX_INTERVAL = 1.0  # seconds between stat polls when idle
+TAIL_START_BYTES = 10240  # Last 10KB of an existing transcript is read on open
+TAIL_READ_CHUNK_BYTES = 1 << 20  # Appended data is read at most 1MB at a time
+TAIL_MAX_LINE_BYTES = 1 << 20  # Longer lines (huge tool outputs) are scanned, not parsed
 
 # Debug settings (Default False for faster startup)
 DEBUG_TEST_VOICE = False  # True: Enable test voice, False: Silent mode (recommended)
@@ -127,6 +251,7 @@ def cleanup_at_exit():
     """Cleanup function called at exit"""
     logger.info("[Exit] Performing cleanup...")
     _stop_flag.set()
+    close_audio_store()
     
     # Clean up PID file
     pid_file = Path.home() / '.claude' / 'kanon_aloud.pid'
@@ -191,149 +316,1775 @@ def cleanup_duplicate_processes():
         logger.warning(f"[Cleanup] Error during cleanup: {e}")
 
 # ===============================
-# Speech worker (simplified)
+# AivisSpeech Engine client (v4.2)
 # ===============================
-def speech_worker_simple():
+class EngineError(Exception):
+    """Non-200 response from AivisSpeech Engine"""
+
+
+class EngineEndpointMissing(EngineError):
+    """The engine does not implement the requested endpoint"""
+
+
+class EngineUnavailable(EngineError):
+    """The engine is down, restarting or overloaded (retryable)"""
+
+
+class AivisEngineClient:
     """
-    Speech worker with cancel support (v4.0)
-    Low-volume speech (thinking/tool) is cancelled when normal text arrives.
+    AivisSpeech Engine API client.
+    Owns a pooled keep-alive requests.Session so per-chunk calls reuse
+    open TCP connections instead of reconnecting every time.
     """
-    import io
 
-    pygame.mixer.init(frequency=24000, size=-16, channels=1)
+    def __init__(self, base_url, timeout=30, pool_size=4):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (ENGINE_CONNECT_TIMEOUT, timeout)
+        self.session = requests.Session()
+        # v4.2: No transport-level retries; EnginePool retries within its budget
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, path, timeout=None, **kwargs):
+        response = self.session.request(
+            method, f"{self.base_url}{path}",
+            timeout=timeout or self.timeout, **kwargs
+        )
+        if response.status_code in (502, 503, 504):
+            response.close()
+            raise EngineUnavailable(f"Engine unavailable: {response.status_code}")
+        return response
+
+    def version(self):
+        response = self.request('GET', '/version')
+        if response.status_code != 200:
+            raise EngineError(f"Version check failed: {response.status_code}")
+        return response.json()
+
+    def speakers(self):
+        response = self.request('GET', '/speakers')
+        if response.status_code != 200:
+            raise EngineError(f"Speaker list failed: {response.status_code}")
+        return response.json()
+
+    def initialize_speaker(self, speaker, skip_reinit=True):
+        """Load the speaker's model (blocks until loaded)"""
+        response = self.request(
+            'POST', f"/initialize_speaker?speaker={speaker}&skip_reinit={str(skip_reinit).lower()}"
+        )
+        if response.status_code not in (200, 204):
+            raise EngineError(f"Speaker initialization failed: {response.status_code}")
+
+    def is_initialized_speaker(self, speaker):
+        response = self.request('GET', f"/is_initialized_speaker?speaker={speaker}")
+        if response.status_code != 200:
+            raise EngineError(f"Speaker status check failed: {response.status_code}")
+        return bool(response.json())
+
+    def engine_manifest(self):
+        response = self.request('GET', '/engine_manifest')
+        if response.status_code != 200:
+            raise EngineError(f"Engine manifest failed: {response.status_code}")
+        return response.json()
+
+    def audio_query(self, text, speaker, raw=False):
+        """
+        Return the AudioQuery dict for text (URL-encoded, v3.2.3)
+        With raw=True the undecoded JSON body is returned instead.
+        """
+        encoded_text = quote(text, safe='')
+        response = self.request('POST', f"/audio_query?speaker={speaker}&text={encoded_text}")
+        if response.status_code != 200:
+            raise EngineError(f"AudioQuery failed: {response.status_code}")
+        return response.content if raw else response.json()
+
+    def synthesis(self, audio_query, speaker):
+        """Return WAV bytes for an AudioQuery"""
+        response = self.request('POST', f"/synthesis?speaker={speaker}", json=audio_query)
+        if response.status_code != 200:
+            raise EngineError(f"Synthesis failed: {response.status_code}")
+        return response.content
+
+    def synthesis_stream(self, audio_query, speaker):
+        """Start /synthesis and return the streaming Response (caller must close it)"""
+        response = self.request('POST', f"/synthesis?speaker={speaker}", json=audio_query, stream=True)
+        if response.status_code != 200:
+            response.close()
+            raise EngineError(f"Synthesis failed: {response.status_code}")
+        return response
+
+    def multi_synthesis(self, audio_queries, speaker):
+        """
+        Synthesize several AudioQueries in one request.
+        Returns WAV bytes in query order; raises EngineEndpointMissing if
+        the engine does not provide /multi_synthesis.
+        """
+        import io
+
+        response = self.request('POST', f"/multi_synthesis?speaker={speaker}", json=audio_queries)
+        if response.status_code in (404, 405):
+            raise EngineEndpointMissing(f"Multi synthesis unavailable: {response.status_code}")
+        if response.status_code != 200:
+            raise EngineError(f"Multi synthesis failed: {response.status_code}")
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            names = sorted(n for n in archive.namelist() if n.lower().endswith('.wav'))
+            wavs = [archive.read(name) for name in names]
+        if len(wavs) != len(audio_queries):
+            raise EngineError(f"Multi synthesis returned {len(wavs)} of {len(audio_queries)} files")
+        return wavs
+
+    def close(self):
+        self.session.close()
+
+
+class _EngineSlot:
+    """Load, latency and circuit breaker bookkeeping for one engine endpoint"""
+
+    def __init__(self, client):
+        self.client = client
+        self.in_flight = 0
+        self.latency = {}  # method -> EWMA seconds
+        self.healthy = True  # False while the circuit breaker is open
+        self.consecutive_failures = 0
+        self.backoff = ENGINE_BREAKER_BASE_BACKOFF
+        self.retry_at = 0.0  # Next health probe while open
+        self.requests = 0
+        self.failures = 0
+
+    def expected_latency(self, method):
+        return self.latency.get(method, ENGINE_INITIAL_LATENCY)
+
+    def record_latency(self, method, elapsed):
+        previous = self.latency.get(method)
+        if previous is None:
+            self.latency[method] = elapsed
+        else:
+            self.latency[method] = previous + ENGINE_LATENCY_EWMA_ALPHA * (elapsed - previous)
 
-    logger.info("[SpeechWorker] Worker started (v4.0 with cancel support)")
 
-    while not _stop_flag.is_set():
+class EnginePool:
+    """
+    Least-loaded dispatcher over one or more AivisSpeech Engine processes (v4.2).
+    Exposes the same call methods as AivisEngineClient. Each call goes to the
+    healthy engine with the lowest (in_flight + 1) * latency EWMA for that
+    method.
+
+    Each engine has a circuit breaker: after ENGINE_BREAKER_THRESHOLD
+    consecutive failures it opens and no calls are sent until a /version
+    health probe succeeds (probes back off exponentially). Failed calls are
+    retried up to retry_count times, limited by a pool-wide retry budget so
+    an outage does not multiply the load on a recovering engine.
+    """
+
+    def __init__(self, clients, retry_count=3):
+        self.slots = [_EngineSlot(client) for client in clients]
+        self.retry_count = retry_count
+        self._lock = threading.Lock()
+        self._retry_tokens = float(retry_count)
+        self._available = threading.Event()
+        self._available.set()
+        self._prober = None
+        self.resumed_at = 0.0  # When the last full outage ended
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def base_url(self):
+        return self.slots[0].client.base_url
+
+    def available(self):
+        """True unless every engine's circuit breaker is open"""
+        return self._available.is_set()
+
+    def wait_available(self, timeout=None):
+        return self._available.wait(timeout)
+
+    def _pick(self, method, exclude):
+        with self._lock:
+            available = [slot for slot in self.slots if slot.healthy]
+            if not available:
+                return None
+            # Prefer engines this call has not failed on yet
+            untried = [slot for slot in available if slot not in exclude]
+            slot = min(untried or available,
+                       key=lambda s: (s.in_flight + 1) * s.expected_latency(method))
+            slot.in_flight += 1
+            slot.requests += 1
+            return slot
+
+    def _release(self, slot, method, elapsed=None):
+        with self._lock:
+            slot.in_flight -= 1
+            if elapsed is not None:
+                slot.consecutive_failures = 0
+                slot.record_latency(method, elapsed)
+                self._retry_tokens = min(float(self.retry_count),
+                                         self._retry_tokens + ENGINE_RETRY_BUDGET_RATIO)
+                return
+            slot.failures += 1
+            slot.consecutive_failures += 1
+            if slot.healthy and slot.consecutive_failures >= ENGINE_BREAKER_THRESHOLD:
+                self._open(slot)
+
+    def _open(self, slot):
+        """Open a slot's circuit breaker (lock held)"""
+        slot.healthy = False
+        slot.backoff = ENGINE_BREAKER_BASE_BACKOFF
+        slot.retry_at = time.time() + slot.backoff
+        logger.warning(f"[EnginePool] {slot.client.base_url} unreachable, circuit open")
+        if not any(s.healthy for s in self.slots):
+            self._available.clear()
+        if self._prober is None or not self._prober.is_alive():
+            self._prober = threading.Thread(target=self._probe_loop, name='EngineProbe', daemon=True)
+            self._prober.start()
+
+    def _probe_loop(self):
+        """Health-probe open engines until every breaker is closed again"""
+        while not _stop_flag.is_set():
+            with self._lock:
+                down = [slot for slot in self.slots if not slot.healthy]
+                if not down:
+                    return
+                slot = min(down, key=lambda s: s.retry_at)
+            delay = slot.retry_at - time.time()
+            if delay > 0:
+                _stop_flag.wait(min(delay, 0.5))
+                continue
+            try:
+                slot.client.request('GET', '/version', timeout=ENGINE_PROBE_TIMEOUT).raise_for_status()
+            except Exception:
+                with self._lock:
+                    slot.backoff = min(slot.backoff * 2, ENGINE_BREAKER_MAX_BACKOFF)
+                    slot.retry_at = time.time() + slot.backoff
+                continue
+            with self._lock:
+                slot.healthy = True
+                slot.consecutive_failures = 0
+                if not self._available.is_set():
+                    self.resumed_at = time.time()
+                self._available.set()
+            logger.info(f"[EnginePool] {slot.client.base_url} is back, circuit closed")
+
+    def _abandon(self, slot):
+        """Release a slot whose call was cancelled, without counting a failure"""
+        with self._lock:
+            slot.in_flight -= 1
+
+    def _take_retry_token(self):
+        with self._lock:
+            if self._retry_tokens < 1.0:
+                return False
+            self._retry_tokens -= 1.0
+            return True
+
+    def _dispatch(self, method, *args, **kwargs):
+        tried = set()
+        attempt = 0
+        while True:
+            slot = self._pick(method, tried)
+            if slot is None:
+                raise EngineUnavailable("No AivisSpeech Engine available (circuit open)")
+            tried.add(slot)
+            start = time.time()
+            try:
+                result = getattr(slot.client, method)(*args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout, EngineUnavailable) as e:
+                self._release(slot, method)
+                # Never re-send a request the engine may still be synthesizing
+                if isinstance(e, requests.ReadTimeout):
+                    raise
+                if attempt >= self.retry_count or not self._take_retry_token():
+                    raise
+                attempt += 1
+                if len(tried) == len(self.slots):
+                    _stop_flag.wait(ENGINE_RETRY_BACKOFF * 2 ** (attempt - 1))
+                continue
+            except Exception:
+                self._release(slot, method, time.time() - start)
+                raise
+            self._release(slot, method, time.time() - start)
+            return result
+
+    async def dispatch_async(self, clients, method, *args, **kwargs):
+        """
+        _dispatch for the asyncio pipeline (v4.2): clients[i] is the
+        AsyncEngineClient for slots[i], so both pipelines share the circuit
+        breakers, latency estimates and retry budget.
+        """
+        tried = set()
+        attempt = 0
+        while True:
+            slot = self._pick(method, tried)
+            if slot is None:
+                raise EngineUnavailable("No AivisSpeech Engine available (circuit open)")
+            tried.add(slot)
+            client = clients[self.slots.index(slot)]
+            start = time.time()
+            try:
+                result = await getattr(client, method)(*args, **kwargs)
+            except asyncio.CancelledError:
+                self._abandon(slot)
+                raise
+            except (OSError, asyncio.IncompleteReadError, EngineUnavailable) as e:
+                self._release(slot, method)
+                # Never re-send a request the engine may still be synthesizing
+                if isinstance(e, asyncio.TimeoutError):
+                    raise
+                if attempt >= self.retry_count or not self._take_retry_token():
+                    raise
+                attempt += 1
+                if len(tried) == len(self.slots):
+                    await asyncio.sleep(ENGINE_RETRY_BACKOFF * 2 ** (attempt - 1))
+                continue
+            except Exception:
+                self._release(slot, method, time.time() - start)
+                raise
+            self._release(slot, method, time.time() - start)
+            return result
+
+    def version(self):
+        return self._dispatch('version')
+
+    def speakers(self):
+        return self._dispatch('speakers')
+
+    def engine_manifest(self):
+        return self._dispatch('engine_manifest')
+
+    def audio_query(self, text, speaker, raw=False):
+        return self._dispatch('audio_query', text, speaker, raw=raw)
+
+    def synthesis(self, audio_query, speaker):
+        return self._dispatch('synthesis', audio_query, speaker)
+
+    def synthesis_stream(self, audio_query, speaker):
+        return self._dispatch('synthesis_stream', audio_query, speaker)
+
+    def multi_synthesis(self, audio_queries, speaker):
+        return self._dispatch('multi_synthesis', audio_queries, speaker)
+
+    def close(self):
+        for slot in self.slots:
+            slot.client.close()
+
+    def log_stats(self):
+        for slot in self.slots:
+            latency = ' '.join(f"{m}:{v * 1000:.0f}ms" for m, v in sorted(slot.latency.items()))
+            logger.info(
+                f"[EnginePool] {slot.client.base_url} requests:{slot.requests} "
+                f"failures:{slot.failures} healthy:{slot.healthy} {latency}"
+            )
+
+
+_multi_synthesis_supported = True  # Cleared when the engine lacks /multi_synthesis
+
+_engine = EnginePool([
+    AivisEngineClient(
+        url,
+        timeout=_engine_config.get('timeout', 30),
+        pool_size=SYNTHESIS_LOOKAHEAD + 2,
+    )
+    for url in AIVIS_ENGINE_URLS
+], retry_count=_engine_config.get('retry_count', 3))
+
+# ===============================
+# Audio output format (v4.2)
+# ===============================
+# One format shared by the engine output and the mixer, so decoded PCM is
+# played without SDL resampling every Sound
+_output_format = {
+    'rate': AUDIO_SAMPLE_RATE if isinstance(AUDIO_SAMPLE_RATE, int) else AUDIO_FALLBACK_SAMPLE_RATE,
+    'stereo': AUDIO_CHANNELS == 2,
+}
+
+
+def init_mixer():
+    """
+    Initialize the mixer in the negotiated format (no-op if already open).
+    If the device opened at a different rate/channel count, the engine
+    output follows the mixer instead.
+    """
+    pygame.mixer.init(frequency=_output_format['rate'], size=-16,
+                      channels=2 if _output_format['stereo'] else 1,
+                      buffer=AUDIO_BUFFER_SIZE)
+    mixer_format = pygame.mixer.get_init()
+    if mixer_format:
+        rate, _, channels = mixer_format
+        if (rate, channels == 2) != (_output_format['rate'], _output_format['stereo']):
+            logger.warning(f"[Audio] Mixer opened at {rate}Hz/{channels}ch, "
+                           f"requested {_output_format['rate']}Hz; following the mixer")
+            _output_format['rate'] = rate
+            _output_format['stereo'] = channels == 2
+
+
+def negotiate_audio_format():
+    """
+    Pick the output format from config.json's audio section and the engine's
+    native rate, then open the mixer to match
+    """
+    rate = AUDIO_SAMPLE_RATE
+    if not isinstance(rate, int):
         try:
-            item = _speech_queue.get(timeout=1.0)
+            rate = int(_engine.engine_manifest().get('default_sampling_rate'))
+        except Exception as e:
+            logger.warning(f"[Audio] Engine sampling rate unavailable: {e}")
+            rate = AUDIO_FALLBACK_SAMPLE_RATE
+    _output_format['rate'] = rate
+    _output_format['stereo'] = AUDIO_CHANNELS == 2
+    init_mixer()
+    logger.info(f"[Audio] Output format: {_output_format['rate']}Hz "
+                f"{'stereo' if _output_format['stereo'] else 'mono'} 16bit")
+    return dict(_output_format)
+
+# ===============================
+# Synthesized audio cache (v4.2)
+# ===============================
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by total size in bytes.
+    Tracks hit, miss and eviction counters for logging.
+    """
 
-            if item is None:  # Termination signal
+    def __init__(self, max_bytes, sizeof=len, name='Cache'):
+        self.max_bytes = max_bytes
+        self.name = name
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= self._sizeof(old)
+            self._entries[key] = value
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizeof(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def log_stats(self):
+        st = self.stats()
+        logger.info(
+            f"[{self.name}] entries:{st['entries']} bytes:{st['bytes']} "
+            f"hits:{st['hits']} misses:{st['misses']} evictions:{st['evictions']} "
+            f"hit_rate:{st['hit_rate']:.1%}"
+        )
+
+
+_audio_cache = LRUCache(AUDIO_CACHE_MAX_BYTES, name='AudioCache')
+
+
+def _query_overrides(speed):
+    """AudioQuery fields patched in after /audio_query (all part of the cache key)"""
+    return {
+        'speedScale': speed,
+        # v4.2: Always synthesize at unity volume; gain is applied at playback
+        # so audio is shared across volume tiers
+        'volumeScale': 1.0,
+        # v4.2: Render directly in the mixer's format (see negotiate_audio_format)
+        'outputSamplingRate': _output_format['rate'],
+        'outputStereo': _output_format['stereo'],
+    }
+
+
+def _audio_cache_key(text, overrides):
+    """Cache key: whitespace-normalized text, speaker and AudioQuery knobs"""
+    normalized = ' '.join(text.split())
+    return (normalized, AIVIS_SPEAKER_ID, tuple(sorted(overrides.items())))
+
+
+# AudioQuery JSON depends only on text and speaker; speed/volume are patched
+# in afterwards, so one cached query serves every voice setting (v4.2)
+_audio_query_cache = LRUCache(AUDIO_QUERY_CACHE_MAX_BYTES, name='AudioQueryCache')
+
+
+def _audio_query(text, overrides):
+    """Return a fresh AudioQuery dict for text with overrides applied"""
+    key = (' '.join(text.split()), AIVIS_SPEAKER_ID)
+    raw = _audio_query_cache.get(key)
+    if raw is None:
+        raw = _engine.audio_query(text, AIVIS_SPEAKER_ID, raw=True)
+        _audio_query_cache.put(key, raw)
+    audio_query = json.loads(raw)
+    audio_query.update(overrides)
+    return audio_query
+
+# ===============================
+# Persistent audio store (v4.2)
+# ===============================
+class PersistentAudioStore:
+    """
+    On-disk audio cache that survives restarts.
+
+    WAV data is appended to a pack file (audio.<generation>.pack) and read
+    back through mmap, so a hit is a memoryview into the page cache rather
+    than a copy. index.json maps key digests to [offset, length, crc32,
+    last_used] and is only ever replaced atomically after the pack data it
+    references has been fsynced. Entries are invalidated as a whole when the
+    engine fingerprint (version + speaker model) changes.
+    """
+
+    INDEX_FORMAT = 1
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._generation = 0
+        self._fingerprint = None
+        self._append_handle = None
+        self._map = None
+        self._map_size = 0
+        self._live_bytes = 0
+        self._pack_size = 0
+        self._dirty = False
+        self._last_flush = 0.0
+        self._compacting = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ----- paths -----
+    def _pack_path(self, generation):
+        return self.directory / f"audio.{generation}.pack"
+
+    @property
+    def _index_path(self):
+        return self.directory / "index.json"
+
+    @staticmethod
+    def digest(key):
+        """Stable digest of an in-memory cache key"""
+        return hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+
+    # ----- lifecycle -----
+    def open(self, fingerprint):
+        """Load the index, discarding it if the engine fingerprint changed"""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._fingerprint = fingerprint
+            index = None
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"[AudioStore] Index unreadable, starting empty: {e}")
+
+            if (index and index.get('format') == self.INDEX_FORMAT
+                    and index.get('fingerprint') == fingerprint):
+                self._generation = int(index.get('generation', 0))
+                self._entries = index.get('entries', {})
+            else:
+                if index:
+                    logger.info("[AudioStore] Engine fingerprint changed, invalidating stored audio")
+                self._generation = int(index.get('generation', 0)) + 1 if index else 0
+                self._entries = {}
+                self._dirty = True
+
+            pack_path = self._pack_path(self._generation)
+            self._append_handle = open(pack_path, 'ab')
+            self._pack_size = self._append_handle.tell()
+
+            # Drop entries that point past the end of the pack (crash before fsync)
+            valid = {k: e for k, e in self._entries.items() if e[0] + e[1] <= self._pack_size}
+            if len(valid) != len(self._entries):
+                self._dirty = True
+            self._entries = valid
+            self._live_bytes = sum(e[1] for e in valid.values())
+
+            # Remove packs left behind by earlier generations
+            for stale in self.directory.glob("audio.*.pack"):
+                if stale != pack_path:
+                    try:
+                        stale.unlink()
+                    except OSError:
+                        pass  # Still mapped elsewhere; retry on next start
+
+            self.flush_index()
+            logger.info(f"[AudioStore] Opened: {len(self._entries)} entries, "
+                        f"{self._live_bytes} bytes (generation {self._generation})")
+        self._maybe_compact()
+
+    def close(self):
+        with self._lock:
+            if self._append_handle is None:
+                return
+            self.flush_index(force=True)
+            self._append_handle.close()
+            self._append_handle = None
+            self._map = None
+
+    # ----- index persistence -----
+    def flush_index(self, force=False):
+        """Atomically write the index after fsyncing the pack it references"""
+        with self._lock:
+            if not self._dirty or self._append_handle is None:
+                return
+            if not force and time.time() - self._last_flush < AUDIO_STORE_INDEX_FLUSH_SECONDS:
+                return
+            try:
+                self._append_handle.flush()
+                os.fsync(self._append_handle.fileno())
+                tmp_path = self._index_path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'format': self.INDEX_FORMAT,
+                        'fingerprint': self._fingerprint,
+                        'generation': self._generation,
+                        'entries': self._entries,
+                    }, f, separators=(',', ':'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._index_path)
+                self._dirty = False
+                self._last_flush = time.time()
+            except OSError as e:
+                logger.warning(f"[AudioStore] Index write failed: {e}")
+
+    # ----- lookups -----
+    def _view(self, offset, length):
+        if self._map is None or offset + length > self._map_size:
+            self._append_handle.flush()
+            if self._pack_size == 0:
+                return None
+            with open(self._pack_path(self._generation), 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = len(self._map)
+        return memoryview(self._map)[offset:offset + length]
+
+    def get(self, key):
+        """Return a read-only memoryview of the stored WAV, or None"""
+        digest = self.digest(key)
+        with self._lock:
+            entry = self._entries.get(digest) if self._append_handle else None
+            if entry is None:
+                self.misses += 1
+                return None
+            offset, length, crc = entry[0], entry[1], entry[2]
+            view = self._view(offset, length)
+            if view is None or zlib.crc32(view) != crc:
+                logger.warning("[AudioStore] Corrupt entry dropped")
+                self._remove(digest)
+                self.misses += 1
+                return None
+            entry[3] = int(time.time())
+            self._dirty = True
+            self.hits += 1
+            return view
+
+    def put(self, key, wav):
+        digest = self.digest(key)
+        length = len(wav)
+        if length > self.max_bytes:
+            return
+        with self._lock:
+            if self._append_handle is None or digest in self._entries:
+                return
+            offset = self._pack_size
+            self._append_handle.write(wav)
+            self._pack_size += length
+            self._entries[digest] = [offset, length, zlib.crc32(wav), int(time.time())]
+            self._live_bytes += length
+            self._dirty = True
+            self._evict_to_cap()
+            self.flush_index()
+        self._maybe_compact()
+
+    def _remove(self, digest):
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._live_bytes -= entry[1]
+            self._dirty = True
+
+    def _evict_to_cap(self):
+        if self._live_bytes <= self.max_bytes:
+            return
+        # Evict least recently used entries down to 90% of the cap
+        target = self.max_bytes * 0.9
+        for digest, _ in sorted(self._entries.items(), key=lambda kv: kv[1][3]):
+            if self._live_bytes <= target:
                 break
+            self._remove(digest)
+            self.evictions += 1
+
+    # ----- compaction -----
+    def _maybe_compact(self):
+        with self._lock:
+            dead = self._pack_size - self._live_bytes
+            if (self._compacting or self._append_handle is None
+                    or dead < AUDIO_STORE_COMPACT_MIN_DEAD or dead < self._live_bytes):
+                return
+            self._compacting = True
+        threading.Thread(target=self._compact, name='AudioStoreCompact', daemon=True).start()
+
+    def _compact(self):
+        """Rewrite live entries into a new pack generation in the background"""
+        try:
+            with self._lock:
+                if self._append_handle is None:
+                    return
+                old_generation = self._generation
+                snapshot = {k: list(e) for k, e in self._entries.items()}
+                self._append_handle.flush()
+            new_generation = old_generation + 1
+            new_path = self._pack_path(new_generation)
+
+            with open(self._pack_path(old_generation), 'rb') as src, open(new_path, 'wb') as out:
+                new_entries = {}
+                position = 0
+
+                def copy_entry(digest, entry):
+                    nonlocal position
+                    src.seek(entry[0])
+                    out.write(src.read(entry[1]))
+                    new_entries[digest] = [position, entry[1], entry[2], entry[3]]
+                    position += entry[1]
+
+                # Bulk copy without holding the lock
+                for digest, entry in snapshot.items():
+                    copy_entry(digest, entry)
+
+                with self._lock:
+                    if self._append_handle is None:
+                        return
+                    self._append_handle.flush()
+                    # Pick up entries written while copying, drop evicted ones
+                    for digest, entry in self._entries.items():
+                        if digest not in new_entries:
+                            copy_entry(digest, entry)
+                        else:
+                            new_entries[digest][3] = entry[3]
+                    new_entries = {k: e for k, e in new_entries.items() if k in self._entries}
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                    self._append_handle.close()
+                    self._append_handle = open(new_path, 'ab')
+                    self._generation = new_generation
+                    self._entries = new_entries
+                    self._pack_size = position
+                    self._live_bytes = sum(e[1] for e in new_entries.values())
+                    self._map = None
+                    self._dirty = True
+                    self.flush_index(force=True)
+
+            try:
+                self._pack_path(old_generation).unlink()
+            except OSError:
+                pass  # Still mapped by a playing sound; removed on next start
+            logger.info(f"[AudioStore] Compacted to generation {new_generation} ({position} bytes)")
+        except Exception as e:
+            logger.warning(f"[AudioStore] Compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    def log_stats(self):
+        with self._lock:
+            logger.info(
+                f"[AudioStore] entries:{len(self._entries)} live_bytes:{self._live_bytes} "
+                f"pack_bytes:{self._pack_size} hits:{self.hits} misses:{self.misses} "
+                f"evictions:{self.evictions}"
+            )
+
+
+_audio_store = None
+
 
-            if len(item) == 3:
-                text, speed, volume = item
+def _engine_fingerprint():
+    """Identify the engine version and speaker model behind cached audio"""
+    try:
+        version = _engine.version()
+        speakers = _engine.speakers()
+    except Exception as e:
+        logger.warning(f"[AudioStore] Fingerprint unavailable: {e}")
+        return None
+
+    speaker_info = None
+    for speaker in speakers:
+        for style in speaker.get('styles', []):
+            if style.get('id') == AIVIS_SPEAKER_ID:
+                speaker_info = [speaker.get('speaker_uuid'), speaker.get('version'), style.get('name')]
+    return f"{version}|{AIVIS_SPEAKER_ID}|{json.dumps(speaker_info, ensure_ascii=False)}"
+
+
+def open_audio_store():
+    """Open the persistent audio store for the current engine, if possible"""
+    global _audio_store
+    fingerprint = _engine_fingerprint()
+    if fingerprint is None:
+        return False
+    try:
+        store = PersistentAudioStore(AUDIO_STORE_DIR, AUDIO_STORE_MAX_BYTES)
+        store.open(fingerprint)
+    except Exception as e:
+        logger.warning(f"[AudioStore] Disabled: {e}")
+        return False
+    _audio_store = store
+    return True
+
+
+def close_audio_store():
+    if _audio_store is not None:
+        _audio_store.log_stats()
+        _audio_store.close()
+
+
+def _parse_wav_header(data):
+    """
+    Locate the PCM payload of a WAV buffer.
+    Returns (channels, sample_rate, bits, data_offset, data_length) or None.
+    """
+    if len(data) < 12 or bytes(data[0:4]) != b'RIFF' or bytes(data[8:12]) != b'WAVE':
+        return None
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = bytes(data[pos:pos + 4])
+        chunk_size = struct.unpack_from('<I', data, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            audio_format, channels, rate = struct.unpack_from('<HHI', data, body)
+            bits = struct.unpack_from('<H', data, body + 14)[0]
+            fmt = (audio_format, channels, rate, bits)
+        elif chunk_id == b'data':
+            if fmt is None or fmt[0] != 1:  # PCM only
+                return None
+            length = min(chunk_size, len(data) - body)
+            return fmt[1], fmt[2], fmt[3], body, length
+        pos = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _make_sound(wav):
+    """
+    Build a pygame Sound from WAV bytes or a memoryview.
+    PCM already in the mixer's format is handed over as a buffer slice
+    without an intermediate copy; anything else goes through the WAV loader.
+    """
+    import io
+
+    mixer_format = pygame.mixer.get_init()
+    header = _parse_wav_header(wav)
+    if header and mixer_format:
+        channels, rate, bits, offset, length = header
+        if (rate, -bits, channels) == tuple(mixer_format):
+            return pygame.mixer.Sound(buffer=memoryview(wav)[offset:offset + length])
+    return pygame.mixer.Sound(io.BytesIO(bytes(wav)))
+
+# ===============================
+# Speech worker (pipelined)
+# ===============================
+class _SpeechSegment:
+    """One playable chunk of a queued item, tracked from synthesis to playback"""
+    __slots__ = ('text', 'speed', 'volume', 'pause_after', 'is_last', 'future', 'batch',
+                 'enqueued_at')
+
+    def __init__(self, text, speed, volume, pause_after=0.0, is_last=True, enqueued_at=None):
+        self.text = text
+        self.speed = speed
+        self.volume = volume
+        self.pause_after = pause_after
+        self.is_last = is_last
+        self.future = None
+        self.batch = None  # Segments synthesized together via /multi_synthesis
+        self.enqueued_at = enqueued_at or time.time()
+
+    @property
+    def is_low_priority(self):
+        return self.volume < VOLUME_NORMAL
+
+    def is_stale(self, now):
+        return _is_stale(self.enqueued_at, self.volume, now)
+
+
+def _is_stale(enqueued_at, volume, now):
+    """Speech held longer than SPEECH_STALE_SECONDS(_LOW) is no longer worth playing"""
+    limit = SPEECH_STALE_SECONDS_LOW if volume < VOLUME_NORMAL else SPEECH_STALE_SECONDS
+    return now - enqueued_at > limit
+
+
+def _held_item_is_stale(item):
+    """
+    True for a queue item that was waiting through an engine outage and is
+    now stale (v4.2). Items queued since the engine came back are never
+    dropped, however long the backlog of a long answer takes to read.
+    """
+    if len(item) < 4 or item[3] >= _engine.resumed_at:
+        return False
+    return _is_stale(item[3], _unpack_item(item)[2], time.time())
+
+
+def _unpack_item(item):
+    """Return (text, speed, volume) for a speech queue item"""
+    if len(item) >= 3:
+        return item[:3]
+    text, speed = item
+    return text, speed, VOLUME_NORMAL
+
+
+def _expand_item(item):
+    """Split a queue item into segments in playback order"""
+    text, speed, volume = _unpack_item(item)
+    enqueued_at = item[3] if len(item) > 3 else None
+    final_pause = item[4] if len(item) > 4 else 0.0  # Before the next item (v4.2)
+
+    # v4.2: Short first chunk, later chunks sized from the measured RTF
+    chunks = plan_chunks(text)
+
+    segments = []
+    for i, chunk in enumerate(chunks, 1):
+        is_last = (i == len(chunks))
+        if is_last:
+            pause = final_pause
+        elif '。。' in chunk:
+            pause = NARRATION_PAUSE_PARAGRAPH
+        elif chunk.rstrip().endswith(('、', ',')):
+            pause = NARRATION_PAUSE_CLAUSE
+        else:
+            pause = NARRATION_PAUSE_SENTENCE
+        segments.append(_SpeechSegment(chunk, speed, volume, pause, is_last, enqueued_at))
+
+    # v4.2: The first chunks are synthesized alone for a fast start. Once
+    # chunks reach full size, the rest of a long message goes to the engine
+    # in /multi_synthesis batches; a growing chunk batched with the chunks
+    # after it could not play until all of them were synthesized.
+    rest = segments[max(1, growth_phase_chunks()):]
+    if MULTI_SYNTHESIS_ENABLED and _multi_synthesis_supported and len(rest) > 1:
+        for i in range(0, len(rest), MULTI_SYNTHESIS_MAX_BATCH):
+            batch = rest[i:i + MULTI_SYNTHESIS_MAX_BATCH]
+            if len(batch) > 1:
+                for seg in batch:
+                    seg.batch = batch
+    return segments
+
+
+def _drop_low_priority_segments(pending):
+    """Remove not-yet-played low-priority segments from the lookahead window"""
+    kept = deque()
+    dropped = 0
+    for seg in pending:
+        if seg.is_low_priority:
+            if seg.future is not None:
+                seg.future.cancel()
+            dropped += 1
+        else:
+            kept.append(seg)
+    pending.clear()
+    pending.extend(kept)
+    return dropped
+
+
+def _lookahead_depth():
+    """Segments kept synthesizing ahead of playback: at least one per engine"""
+    return max(SYNTHESIS_LOOKAHEAD, len(_engine))
+
+
+def _fill_lookahead(pending, block=False):
+    """
+    Pull queued items into the lookahead window until it holds
+    _lookahead_depth() segments beyond the next one to play (v4.2).
+    Returns False when the termination signal is received.
+    """
+    while len(pending) <= _lookahead_depth():
+        try:
+            if block and not pending:
+                item = _speech_queue.get(timeout=1.0)
             else:
-                text, speed = item
-                volume = VOLUME_NORMAL
+                item = _speech_queue.get_nowait()
+        except queue.Empty:
+            return True
+
+        if item is None:  # Termination signal
+            return False
+
+        if _held_item_is_stale(item):
+            logger.info("[SpeechWorker] Dropped stale item held during engine outage")
+            _speech_queue.task_done()
+            continue
+
+        text, speed, volume = _unpack_item(item)
+
+        # v4.0: If this is normal-volume text, cancel any in-progress low-priority speech
+        if volume >= VOLUME_NORMAL:
+            _cancel_current.set()
+            drained = _drop_low_priority_segments(pending)
+            if drained > 0:
+                logger.info(f"[SpeechWorker] Cancelled {drained} low-priority items")
+
+        logger.info(f"[SpeechWorker] Processing: {len(text)} chars (vol:{volume})")
+        pending.extend(_expand_item(item))
+        _speech_queue.task_done()
+    return True
+
+
+def _schedule_synthesis(pending, executor):
+    """Start synthesis for the next segments in playback order"""
+    for seg in islice(pending, _lookahead_depth() + 1):
+        if seg.future is not None:
+            continue
+        if seg.batch:
+            batch = [s for s in seg.batch if s.future is None]
+            for s in batch:
+                s.future = Future()
+            executor.submit(synthesize_batch, batch)
+        else:
+            seg.future = executor.submit(synthesize_chunk, seg.text, seg.speed)
+
+
+def _hold_for_engine(pending):
+    """
+    Keep pending speech while every engine's circuit is open (v4.2)
+    Returns when an engine is back (or on stop), then drops segments that
+    became stale and resets those whose synthesis failed during the outage.
+    Stale items still in the queue are dropped by _fill_lookahead.
+    Returns False when the termination signal is received.
+    """
+    logger.warning(f"[SpeechWorker] Engine unavailable, holding {len(pending)} segments")
+    running = True
+    while running and not _stop_flag.is_set() and not _engine.wait_available(0.2):
+        running = _fill_lookahead(pending)
+
+    now = time.time()
+    kept = deque()
+    for seg in pending:
+        if seg.is_stale(now):
+            if seg.future is not None:
+                seg.future.cancel()
+            continue
+        if (seg.future is not None and seg.future.done() and not seg.future.cancelled()
+                and seg.future.result() is None):
+            seg.future = None  # Synthesize again
+        kept.append(seg)
+    dropped = len(pending) - len(kept)
+    pending.clear()
+    pending.extend(kept)
+    if not _stop_flag.is_set():
+        logger.info(f"[SpeechWorker] Engine available, resuming "
+                    f"({len(kept)} segments, {dropped} stale dropped)")
+    return running
+
+
+def _wait_for_audio(seg):
+    """Wait for a segment's synthesis result, honouring stop/cancel signals"""
+    while not _stop_flag.is_set():
+        if seg.is_low_priority and _cancel_current.is_set():
+            return None
+        try:
+            return seg.future.result(timeout=0.1)
+        except FuturesTimeoutError:
+            continue
+        except CancelledError:
+            return None
+    return None
+
 
-            is_low_priority = (volume < VOLUME_NORMAL)
+def speech_worker_simple():
+    """
+    Speech worker with cancel support and synthesis lookahead (v4.2)
+    Low-volume speech (thinking/tool) is cancelled when normal text arrives.
+    While one chunk plays, the next SYNTHESIS_LOOKAHEAD chunks (including
+    those of following queue items) are synthesized in the background, so
+    the gap between sentences is only the playback handoff. With several
+    engines the lookahead widens so every engine has work; results are
+    still played in queue order.
+    """
+    init_mixer()
+
+    depth = _lookahead_depth()
+    logger.info(f"[SpeechWorker] Worker started (v4.2 with cancel support, "
+                f"lookahead:{depth}, engines:{len(_engine)})")
 
-            # v4.0: If this is normal-volume text, cancel any in-progress low-priority speech
-            if not is_low_priority:
-                _cancel_current.set()
-                # Brief wait for current playback to stop
-                time.sleep(0.05)
-                pygame.mixer.stop()
+    executor = ThreadPoolExecutor(max_workers=depth + 1,
+                                  thread_name_prefix='SpeechSynth')
+    pending = deque()  # Segments waiting for playback, oldest first
+    running = True
+
+    def refill():
+        # Called while audio is playing: keep the lookahead window full
+        nonlocal running
+        if running:
+            running = _fill_lookahead(pending)
+            _schedule_synthesis(pending, executor)
+
+    try:
+        while running and not _stop_flag.is_set():
+            try:
+                running = _fill_lookahead(pending, block=True)
+                if not pending:
+                    _speech_busy.clear()
+                    continue
+                _speech_busy.set()
+
+                # v4.2: Circuit open: wait for the engine instead of burning timeouts
+                if not _engine.available():
+                    running = _hold_for_engine(pending)
+                    continue
+
+                head = pending[0]
                 _cancel_current.clear()
-                # Drain remaining low-priority items from queue
-                drained = 0
-                while not _speech_queue.empty():
-                    try:
-                        peek = _speech_queue.get_nowait()
-                        if peek is None:
-                            _speech_queue.put(None)  # Re-add termination signal
-                            break
-                        p_vol = peek[2] if len(peek) == 3 else VOLUME_NORMAL
-                        if p_vol >= VOLUME_NORMAL:
-                            # Keep normal-volume items — put back
-                            _speech_queue.put(peek)
-                            break
-                        drained += 1
-                        _speech_queue.task_done()
-                    except queue.Empty:
-                        break
-                if drained > 0:
-                    logger.info(f"[SpeechWorker] Cancelled {drained} low-priority items")
-
-            logger.info(f"[SpeechWorker] Processing: {len(text)} chars (vol:{volume})")
-
-            if len(text) > AIVIS_MAX_LENGTH:
-                chunks = split_text_naturally(text, AIVIS_OPTIMAL_LENGTH)
-
-                for i, chunk in enumerate(chunks, 1):
-                    if _stop_flag.is_set():
-                        break
-                    # v4.0: Cancel low-priority speech if signalled
-                    if is_low_priority and _cancel_current.is_set():
-                        logger.info("[SpeechWorker] Low-priority speech cancelled")
-                        break
-
-                    speak_single_chunk(chunk, speed, volume)
-
-                    if i < len(chunks):
-                        if '。。' in chunk:
-                            time.sleep(NARRATION_PAUSE_PARAGRAPH)
-                        else:
-                            time.sleep(NARRATION_PAUSE_SENTENCE)
+
+                if STREAMING_PLAYBACK and head.future is None and not head.batch:
+                    # Not prefetched: play it while it downloads
+                    seg = pending.popleft()
+                    _schedule_synthesis(pending, executor)
+                    played = stream_segment(seg, on_wait=refill)
+                else:
+                    _schedule_synthesis(pending, executor)
+                    seg = pending.popleft()
+                    wav = _wait_for_audio(seg)
+                    played = wav is not None
+                    if played:
+                        play_audio(wav, seg.volume, on_wait=refill,
+                                   interruptible=seg.is_low_priority)
+
+                if not played and not _engine.available():
+                    # Failed because the engine went down: retry once it is back
+                    seg.future = None
+                    pending.appendleft(seg)
+                    continue
+
+                # v4.0: Cancel low-priority speech if signalled
+                if seg.is_low_priority and _cancel_current.is_set():
+                    logger.info("[SpeechWorker] Low-priority speech cancelled")
+                else:
+                    if seg.is_last:
+                        logger.info("[SpeechWorker] Reading completed")
+                    if seg.pause_after:
+                        time.sleep(seg.pause_after)
+
+            except Exception as e:
+                logger.error(f"[SpeechWorker] Error: {e}")
+    finally:
+        for seg in pending:
+            if seg.future is not None:
+                seg.future.cancel()
+        executor.shutdown(wait=False)
+
+def _cached_audio(cache_key):
+    """Look a chunk up in the phrase bank, memory cache and persistent store"""
+    wav = _phrase_bank.get(cache_key)
+    if wav is not None:
+        return wav
+    wav = _audio_cache.get(cache_key)
+    if wav is not None:
+        return wav
+    if _audio_store is not None:
+        return _audio_store.get(cache_key)
+    return None
+
+_rtf_lock = threading.Lock()
+_synthesis_rtf = None  # EWMA of engine seconds per second of audio
+
+def _wav_duration(wav):
+    header = _parse_wav_header(wav)
+    if header is None:
+        return 0.0
+    channels, rate, bits, _, length = header
+    return length / float(rate * channels * bits // 8)
+
+def record_synthesis_time(elapsed, wavs):
+    """Update the real-time factor from one engine call producing wavs"""
+    global _synthesis_rtf
+    duration = sum(_wav_duration(wav) for wav in wavs)
+    if duration <= 0:
+        return
+    rtf = elapsed / duration
+    with _rtf_lock:
+        if _synthesis_rtf is None:
+            _synthesis_rtf = rtf
+        else:
+            _synthesis_rtf += ENGINE_LATENCY_EWMA_ALPHA * (rtf - _synthesis_rtf)
+
+def synthesis_rtf():
+    """Measured real-time factor of the engine, or None before the first synthesis"""
+    return _synthesis_rtf
+
+def _remember_audio(cache_key, wav):
+    _audio_cache.put(cache_key, wav)
+    if _audio_store is not None:
+        _audio_store.put(cache_key, wav)
+
+def synthesize_chunk(text, speed):
+    """
+    Synthesize a single chunk at unity volume and return WAV bytes,
+    or None on failure (v4.2)
+    Cached audio is returned without contacting the engine.
+    """
+    overrides = _query_overrides(speed)
+    cache_key = _audio_cache_key(text, overrides)
+    wav = _cached_audio(cache_key)
+    if wav is not None:
+        return wav
+
+    try:
+        start = time.time()
+        audio_query = _audio_query(text, overrides)
+        wav = _engine.synthesis(audio_query, AIVIS_SPEAKER_ID)
+        record_synthesis_time(time.time() - start, [wav])
+        _remember_audio(cache_key, wav)
+        return wav
+
+    except EngineError as e:
+        logger.error(str(e))
+        return None
+    except Exception as e:
+        logger.error(f"Synthesis error: {e}")
+        return None
+
+def synthesize_batch(segments):
+    """
+    Synthesize several segments with one /multi_synthesis request (v4.2)
+    Each segment's future is resolved in order as soon as its audio is
+    available. Falls back to per-chunk synthesis when the engine has no
+    /multi_synthesis endpoint.
+    """
+    global _multi_synthesis_supported
+
+    # Skip segments cancelled before the batch started
+    segments = [seg for seg in segments if seg.future.set_running_or_notify_cancel()]
+    if not segments:
+        return
+
+    todo = []
+    try:
+        for seg in segments:
+            cache_key = _audio_cache_key(seg.text, _query_overrides(seg.speed))
+            wav = _cached_audio(cache_key)
+            if wav is not None and not todo:
+                seg.future.set_result(wav)  # Leading cache hits play immediately
             else:
-                speak_single_chunk(text, speed, volume)
+                todo.append((seg, cache_key, wav))
+
+        uncached = [(seg, key) for seg, key, wav in todo if wav is None]
+        if len(uncached) > 1 and _multi_synthesis_supported:
+            start = time.time()
+            queries = []
+            for seg, _ in uncached:
+                queries.append(_audio_query(seg.text, _query_overrides(seg.speed)))
+            try:
+                wavs = _engine.multi_synthesis(queries, AIVIS_SPEAKER_ID)
+                record_synthesis_time(time.time() - start, wavs)
+            except EngineEndpointMissing as e:
+                logger.info(f"[SpeechWorker] {e}; using per-chunk synthesis")
+                _multi_synthesis_supported = False
+                # One /synthesis per segment below (AudioQueries are cached),
+                # so each future resolves as soon as its own audio is ready
+                wavs = ()
+            synthesized = {}
+            for (seg, cache_key), wav in zip(uncached, wavs):
+                _remember_audio(cache_key, wav)
+                synthesized[id(seg)] = wav
+            todo = [(seg, key, wav if wav is not None else synthesized.get(id(seg)))
+                    for seg, key, wav in todo]
+
+        for seg, _, wav in todo:
+            if wav is None:
+                wav = synthesize_chunk(seg.text, seg.speed)
+            seg.future.set_result(wav)
+
+    except Exception as e:
+        logger.error(str(e) if isinstance(e, EngineError) else f"Synthesis error: {e}")
+        for seg in segments:
+            if not seg.future.done():
+                seg.future.set_result(None)
+
+def _wait_channel(channel, on_wait=None, interruptible=True, queue_slot=False):
+    """
+    Block while channel is busy, or with queue_slot until its queue is free.
+    on_wait is called periodically. Returns False if playback was interrupted.
+    """
+    last_tick = 0.0
+    while channel.get_busy() and not (queue_slot and channel.get_queue() is None):
+        if _stop_flag.is_set():
+            return False
+        # v4.0: also check cancel signal
+        if interruptible and _cancel_current.is_set():
+            channel.stop()
+            return False
+        now = time.time()
+        if on_wait and now - last_tick >= 0.05:
+            last_tick = now
+            on_wait()
+        pygame.time.wait(5 if queue_slot else 10)
+    return True
+
+def play_audio(wav, volume=1.0, on_wait=None, interruptible=True):
+    """
+    Play WAV bytes (or a memoryview from the audio store) and block
+    until playback finishes (v4.2)
+    volume is applied as client-side gain (v3.1.4 volume control).
+    on_wait is called periodically while the audio is playing.
+    """
+    sound = _make_sound(wav)
+    sound.set_volume(volume)
+    channel = sound.play()
+
+    # Wait until finished reading
+    if channel:
+        _wait_channel(channel, on_wait, interruptible)
+
+class _PcmStream:
+    """
+    Plays the PCM payload of a WAV body that is still downloading, as a
+    chain of small Sound slices on one channel (Channel.queue).
+    Falls back to whole-file playback when the WAV is not already in the
+    mixer's format.
+    """
+
+    def __init__(self, volume, interruptible, on_wait):
+        self.volume = volume
+        self.interruptible = interruptible
+        self.on_wait = on_wait
+        self.channel = None
+        self.fallback = False
+        self.started = False
+        self._next = None  # Offset of the first PCM byte not yet played
+        self._data_end = None
+        self._frame = None
+        self._block = None
+
+    def _start(self, body):
+        header = _parse_wav_header(body)
+        if header is None:
+            if len(body) > 4096:  # No data chunk where one should be
+                self.fallback = True
+            return
+        channels, rate, bits, offset, _ = header
+        if (rate, -bits, channels) != tuple(pygame.mixer.get_init() or ()):
+            self.fallback = True
+            return
+        declared = struct.unpack_from('<I', body, offset - 4)[0]
+        self._next = offset
+        self._data_end = offset + declared
+        self._frame = channels * bits // 8
+        self._block = max(self._frame, int(rate * STREAM_BLOCK_SECONDS) * self._frame)
+
+    def _play(self, pcm):
+        sound = pygame.mixer.Sound(buffer=pcm)
+        sound.set_volume(self.volume)
+        if self.channel is not None and self.channel.get_busy():
+            if not _wait_channel(self.channel, self.on_wait, self.interruptible, queue_slot=True):
+                return False
+            if self.channel.get_busy():
+                self.channel.queue(sound)
+                return True
+        if self.channel is None:
+            self.channel = sound.play()
+        else:
+            self.channel.play(sound)  # Underrun: the channel went idle
+        self.started = self.started or self.channel is not None
+        return self.channel is not None
+
+    def feed(self, body, final=False):
+        """Play every complete block available in body; False if interrupted"""
+        if self.fallback:
+            return True
+        if self._next is None:
+            self._start(body)
+            if self._next is None:
+                return True
+        available = min(len(body), self._data_end) - self._next
+        while available >= self._block or (final and available >= self._frame):
+            size = self._block if available >= self._block else available - available % self._frame
+            if not self._play(bytes(body[self._next:self._next + size])):
+                return False
+            self._next += size
+            available -= size
+        return True
+
+    def finish(self, body):
+        """Play the remainder and wait for the channel to drain"""
+        if not self.fallback and self.feed(body, final=True) and self.channel:
+            return _wait_channel(self.channel, self.on_wait, self.interruptible)
+        if self.fallback:
+            play_audio(bytes(body), self.volume, self.on_wait, self.interruptible)
+        return True
+
+def stream_segment(seg, on_wait=None):
+    """
+    Synthesize a segment and start playback as soon as the first PCM block
+    arrives, instead of after the whole WAV body has downloaded (v4.2)
+    """
+    overrides = _query_overrides(seg.speed)
+    cache_key = _audio_cache_key(seg.text, overrides)
+    wav = _cached_audio(cache_key)
+    if wav is not None:
+        play_audio(wav, seg.volume, on_wait=on_wait, interruptible=seg.is_low_priority)
+        return True
+
+    try:
+        start = time.time()
+        audio_query = _audio_query(seg.text, overrides)
+        response = _engine.synthesis_stream(audio_query, AIVIS_SPEAKER_ID)
+    except EngineError as e:
+        logger.error(str(e))
+        return False
+    except Exception as e:
+        logger.error(f"Synthesis error: {e}")
+        return False
+
+    stream = _PcmStream(seg.volume, seg.is_low_priority, on_wait)
+    body = bytearray()
+    complete = False
+    playback_wait = 0.0  # Time feed() spent waiting for the channel, not the engine
+    try:
+        for block in response.iter_content(STREAM_READ_SIZE):
+            body += block
+            fed_at = time.time()
+            fed = stream.feed(body)
+            playback_wait += time.time() - fed_at
+            if not fed:
+                break  # Cancelled or stopping
+        else:
+            complete = True
+            # Measure before finish(), which waits for playback to end
+            elapsed = time.time() - start - playback_wait
+            stream.finish(body)
+    except Exception as e:
+        logger.error(f"Streaming error: {e}")
+    finally:
+        response.close()
+
+    if complete:
+        wav = bytes(body)
+        record_synthesis_time(elapsed, [wav])
+        _remember_audio(cache_key, wav)
+    return stream.started or stream.fallback
+
+# ===============================
+# asyncio speech pipeline (v4.2)
+# ===============================
+class AsyncEngineClient:
+    """
+    Minimal asyncio HTTP/1.1 client for AivisSpeech Engine (stdlib only).
+    Keeps idle keep-alive connections for reuse and bounds the number of
+    concurrent requests with a semaphore.
+    """
+
+    def __init__(self, base_url, timeout=30, max_concurrency=ASYNC_MAX_CONCURRENCY):
+        parts = urlsplit(base_url)
+        self.base_url = base_url.rstrip('/')
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._idle = []  # (reader, writer) pairs ready for reuse
+        self._semaphore = None  # Created inside the running loop
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by engine")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+            body = bytes(body)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+        return status, headers, body
+
+    async def _request(self, method, path, body=b'', content_type='application/json'):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        request_head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        ).encode('ascii')
+
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                # A reused connection may have been closed by the engine: retry once fresh
+                for attempt in range(2):
+                    reused = bool(self._idle)
+                    if reused:
+                        reader, writer = self._idle.pop()
+                    else:
+                        try:
+                            reader, writer = await asyncio.wait_for(
+                                asyncio.open_connection(self.host, self.port), ENGINE_CONNECT_TIMEOUT)
+                        except asyncio.TimeoutError:
+                            # Nothing was sent: safe to retry, unlike a read timeout
+                            raise ConnectionError(f"Connect to {self.base_url} timed out")
+                    try:
+                        writer.write(request_head + body)
+                        await writer.drain()
+                        status, headers, data = await asyncio.wait_for(
+                            self._read_response(reader), self.timeout)
+                    except (ConnectionError, asyncio.IncompleteReadError):
+                        writer.close()
+                        if reused and attempt == 0:
+                            continue
+                        raise
+                    except BaseException:
+                        writer.close()
+                        raise
+                    if headers.get('connection', '').lower() == 'close':
+                        writer.close()
+                    else:
+                        self._idle.append((reader, writer))
+                    if status in (502, 503, 504):
+                        raise EngineUnavailable(f"Engine unavailable: {status}")
+                    return status, data
+            finally:
+                self.in_flight -= 1
+
+    async def audio_query(self, text, speaker, raw=False):
+        encoded_text = quote(text, safe='')
+        status, data = await self._request('POST', f"/audio_query?speaker={speaker}&text={encoded_text}")
+        if status != 200:
+            raise EngineError(f"AudioQuery failed: {status}")
+        return data if raw else json.loads(data)
+
+    async def synthesis(self, audio_query, speaker):
+        body = json.dumps(audio_query).encode('utf-8')
+        status, data = await self._request('POST', f"/synthesis?speaker={speaker}", body)
+        if status != 200:
+            raise EngineError(f"Synthesis failed: {status}")
+        return data
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+async def _wait_engine_async():
+    """Hold until an engine's circuit closes again (or on stop)"""
+    while not _stop_flag.is_set():
+        if await asyncio.to_thread(_engine.wait_available, 0.5):
+            return
+
+
+async def _synthesize_async(clients, seg):
+    """
+    asyncio counterpart of synthesize_chunk, sharing the same caches and
+    engine circuit breakers (v4.2). While every engine is down the segment
+    is held, then dropped if it became stale, as in _hold_for_engine.
+    """
+    overrides = _query_overrides(seg.speed)
+    cache_key = _audio_cache_key(seg.text, overrides)
+    wav = _cached_audio(cache_key)
+    if wav is not None:
+        return wav
+
+    while not _stop_flag.is_set():
+        if not _engine.available():
+            await _wait_engine_async()
+            if seg.is_stale(time.time()):
+                logger.info("[SpeechWorker] Dropped stale segment held during engine outage")
+                return None
+        try:
+            start = time.time()
+            query_key = (' '.join(seg.text.split()), AIVIS_SPEAKER_ID)
+            raw = _audio_query_cache.get(query_key)
+            if raw is None:
+                raw = await _engine.dispatch_async(clients, 'audio_query', seg.text,
+                                                   AIVIS_SPEAKER_ID, raw=True)
+                _audio_query_cache.put(query_key, raw)
+            audio_query = json.loads(raw)
+            audio_query.update(overrides)
+            wav = await _engine.dispatch_async(clients, 'synthesis', audio_query, AIVIS_SPEAKER_ID)
+            record_synthesis_time(time.time() - start, [wav])
+            _remember_audio(cache_key, wav)
+            return wav
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not _engine.available():
+                continue  # Failed because the engine went down: hold, then retry
+            logger.error(str(e) if isinstance(e, EngineError) else f"Synthesis error: {e!r}")
+            return None
+    return None
+
+
+async def _play_async(wav, seg):
+    """Play a segment without blocking the event loop"""
+    sound = _make_sound(wav)
+    sound.set_volume(seg.volume)
+    channel = sound.play()
+    while channel and channel.get_busy() and not _stop_flag.is_set():
+        if seg.is_low_priority and _cancel_current.is_set():
+            channel.stop()
+            break
+        await asyncio.sleep(0.01)
+
+
+async def _async_intake(clients, playback):
+    """Move items from the speech queue into synthesis tasks, in order"""
+    loop = asyncio.get_running_loop()
+    while not _stop_flag.is_set():
+        try:
+            item = await loop.run_in_executor(None, _speech_queue.get, True, 0.5)
+        except queue.Empty:
+            continue
+        if item is None:  # Termination signal
+            break
 
-            logger.info("[SpeechWorker] Reading completed")
+        if _held_item_is_stale(item):
+            logger.info("[SpeechWorker] Dropped stale item held during engine outage")
             _speech_queue.task_done()
-
-        except queue.Empty:
             continue
-        except Exception as e:
-            logger.error(f"[SpeechWorker] Error: {e}")
-            try:
-                _speech_queue.task_done()
-            except ValueError:
-                pass
 
-def speak_single_chunk(text, speed, volume=1.0):
+        text, speed, volume = _unpack_item(item)
+
+        # v4.0: If this is normal-volume text, cancel any in-progress low-priority speech
+        if volume >= VOLUME_NORMAL:
+            _cancel_current.set()
+            kept = []
+            drained = 0
+            while not playback.empty():
+                seg = playback.get_nowait()
+                if seg.is_low_priority:
+                    seg.future.cancel()
+                    drained += 1
+                else:
+                    kept.append(seg)
+            for seg in kept:
+                playback.put_nowait(seg)
+            if drained > 0:
+                logger.info(f"[SpeechWorker] Cancelled {drained} low-priority items")
+
+        logger.info(f"[SpeechWorker] Processing: {len(text)} chars (vol:{volume})")
+        _speech_busy.set()
+        for seg in _expand_item(item):
+            # Bounded queue: at most one segment beyond the lookahead window
+            # synthesizes while intake waits for room
+            seg.future = asyncio.ensure_future(_synthesize_async(clients, seg))
+            await playback.put(seg)
+        _speech_queue.task_done()
+    await playback.put(None)
+
+
+async def _async_playback(playback):
+    """Play synthesized segments in queue order"""
+    while True:
+        seg = await playback.get()
+        if seg is None:
+            break
+        _cancel_current.clear()
+        try:
+            wav = await seg.future
+        except asyncio.CancelledError:
+            wav = None
+        if wav is not None and not (seg.is_low_priority and _cancel_current.is_set()):
+            await _play_async(wav, seg)
+
+        # v4.0: Cancel low-priority speech if signalled
+        if seg.is_low_priority and _cancel_current.is_set():
+            logger.info("[SpeechWorker] Low-priority speech cancelled")
+        else:
+            if seg.is_last:
+                logger.info("[SpeechWorker] Reading completed")
+            if seg.pause_after:
+                await asyncio.sleep(seg.pause_after)
+        if playback.empty():
+            _speech_busy.clear()
+
+
+async def _async_speech_main():
+    clients = [
+        AsyncEngineClient(slot.client.base_url, timeout=_engine_config.get('timeout', 30))
+        for slot in _engine.slots
+    ]
+    playback = asyncio.Queue(maxsize=_lookahead_depth() + 1)
+    try:
+        await asyncio.gather(_async_intake(clients, playback), _async_playback(playback))
+    finally:
+        for client in clients:
+            client.close()
+
+
+def speech_worker_async():
     """
-    Read a single chunk reliably with volume control (v3.1.4)
+    asyncio-based alternative to speech_worker_simple (v4.2)
+    Same narration behavior (chunk planning, caches, low-priority cancel,
+    pauses); synthesis runs as tasks on a stdlib keep-alive HTTP client with
+    bounded concurrency while a playback task plays results in order.
     """
-    import io
-    
-    try:
-        # Generate AudioQuery with proper URL encoding
-        encoded_text = quote(text, safe='')
-        query_response = requests.post(
-            f"{AIVIS_BASE_URL}/audio_query?speaker={AIVIS_SPEAKER_ID}&text={encoded_text}",
-            timeout=10
-        )
-        
-        if query_response.status_code != 200:
-            logger.error(f"AudioQuery failed: {query_response.status_code}")
-            return False
-        
-        audio_query = query_response.json()
-        audio_query['speedScale'] = speed
-        audio_query['volumeScale'] = volume  # v3.1.4: Apply volume setting
-        
-        # Synthesize audio
-        response = requests.post(
-            f"{AIVIS_BASE_URL}/synthesis?speaker={AIVIS_SPEAKER_ID}",
-            json=audio_query,
-            timeout=20
-        )
-        
-        if response.status_code == 200:
-            audio_data = io.BytesIO(response.content)
-            sound = pygame.mixer.Sound(audio_data)
-            channel = sound.play()
-            
-            # Wait until finished reading (v4.0: also check cancel signal)
-            if channel:
-                while channel.get_busy() and not _stop_flag.is_set() and not _cancel_current.is_set():
-                    pygame.time.wait(10)
-                if _cancel_current.is_set() and channel.get_busy():
-                    channel.stop()
-            
-            return True
-        else:
-            logger.error(f"Synthesis failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"Speak error: {e}")
-        return False
+    init_mixer()
+    logger.info(f"[SpeechWorker] Async worker started (lookahead:{_lookahead_depth()}, "
+                f"engines:{len(AIVIS_ENGINE_URLS)})")
+    asyncio.run(_async_speech_main())
+
 
-def enqueue_speech_simple(text, speed=1.0, volume=1.0):
+def _speech_worker_target():
+    """Speech worker function for the configured pipeline mode"""
+    return speech_worker_async if PIPELINE_MODE == 'async' else speech_worker_simple
+
+def enqueue_speech_simple(text, speed=1.0, volume=1.0, pause_after=0.0):
     """
     Add to simple queue with volume control (v3.1.4)
+    pause_after: silence after this item before the next one (v4.2)
     """
     global _speech_thread
     
@@ -344,90 +2095,391 @@ def enqueue_speech_simple(text, speed=1.0, volume=1.0):
     if _speech_thread is None or not _speech_thread.is_alive():
         _stop_flag.clear()
         _speech_thread = threading.Thread(
-            target=speech_worker_simple,
+            target=_speech_worker_target(),
             daemon=True
         )
         _speech_thread.start()
         time.sleep(0.5)
     
     # Add to simple queue with volume parameter
-    _speech_queue.put((text, speed, volume))
+    _speech_queue.put((text, speed, volume, time.time(), pause_after))
     
     logger.info(f"[Queue] Added: {len(text)} chars (vol:{volume}, queue_size:{_speech_queue.qsize()})")
 
+# ===============================
+# Speaker warm-up (v4.2)
+# ===============================
+_speakers_warm = threading.Event()  # Set once every engine has the speakers loaded
+
+
+def warm_up_speakers():
+    """Load the configured speakers' models on every engine"""
+    speakers = list(dict.fromkeys([AIVIS_SPEAKER_ID] + list(AIVIS_EXTRA_SPEAKER_IDS)))
+    start = time.time()
+    try:
+        for slot in _engine.slots:
+            client = slot.client
+            for speaker in speakers:
+                if _stop_flag.is_set():
+                    return
+                try:
+                    if client.is_initialized_speaker(speaker):
+                        continue
+                    client.initialize_speaker(speaker, skip_reinit=True)
+                    logger.info(f"[Warmup] Speaker {speaker} loaded on {client.base_url}")
+                except Exception as e:
+                    logger.warning(f"[Warmup] Speaker {speaker} on {client.base_url}: {e}")
+        logger.info(f"[Warmup] {len(speakers)} speaker(s) ready in {time.time() - start:.2f}s")
+    finally:
+        _speakers_warm.set()
+
+
+def start_speaker_warmup():
+    """Warm up speaker models in the background so startup does not wait for them"""
+    thread = threading.Thread(target=warm_up_speakers, name='SpeakerWarmup', daemon=True)
+    thread.start()
+    return thread
+
+# ===============================
+# Startup phrase bank (v4.2)
+# ===============================
+_phrase_bank = {}  # Audio cache key -> WAV bytes, never evicted
+_speech_busy = threading.Event()  # Set while the speech worker has segments to play
+
+
+def narration_phrase_bank():
+    """
+    Return (text, speed) for every fixed narration string.
+    Tool and thinking narrations use the thinking speed, announcements the normal speed.
+    """
+    tool_phrases = []
+    tool_phrases.extend(jp for _, jp in _DESC_KEYWORDS)
+    tool_phrases.extend(jp for _, jp in _BASH_COMMAND_NARRATIONS)
+    tool_phrases.append(BASH_FALLBACK_NARRATION)
+    labels = list(dict.fromkeys(list(_FILE_TYPE_LABELS.values()) + [FILE_TYPE_FALLBACK_LABEL]))
+    for action in _FILE_TOOL_ACTIONS.values():
+        tool_phrases.extend(f"{label}を{action}" for label in labels)
+    tool_phrases.extend(_TOOL_NARRATIONS.values())
+    tool_phrases.extend(jp for _, jp in _TOOL_NAME_KEYWORDS)
+    tool_phrases.append(TOOL_FALLBACK_NARRATION)
+    tool_phrases.extend(jp for _, jp in _THINKING_PATTERNS)
+    tool_phrases.append(THINKING_FALLBACK_NARRATION)
+
+    phrases = [(text, NARRATION_SPEED_THINKING) for text in dict.fromkeys(tool_phrases)]
+    phrases.extend((text, NARRATION_SPEED_NORMAL) for text in (
+        NARRATION_USER_INPUT, NARRATION_NEW_SESSION, NARRATION_PERMISSION_DENIED,
+    ))
+    return phrases
+
+
+def _prerender_phrase_bank():
+    """Synthesize the phrase bank, yielding to real speech between phrases"""
+    _speakers_warm.wait(SPEAKER_WARMUP_TIMEOUT)
+    rendered = 0
+    for text, speed in narration_phrase_bank():
+        # Low priority: only use the engine while nothing is being read
+        while (_speech_busy.is_set() or not _speech_queue.empty()) and not _stop_flag.is_set():
+            time.sleep(0.2)
+        if _stop_flag.is_set():
+            return
+        key = _audio_cache_key(text, _query_overrides(speed))
+        if key in _phrase_bank:
+            continue
+        wav = synthesize_chunk(text, speed)
+        if wav is not None:
+            _phrase_bank[key] = bytes(wav)
+            rendered += 1
+    size = sum(len(wav) for wav in _phrase_bank.values())
+    logger.info(f"[PhraseBank] {rendered} phrases resident ({size} bytes)")
+
+
+def start_phrase_bank_prerender():
+    """Pre-render fixed narration strings in the background after startup"""
+    thread = threading.Thread(target=_prerender_phrase_bank, name='PhraseBank', daemon=True)
+    thread.start()
+    return thread
+
 # ===============================
 # Text processing functions
 # ===============================
-def split_text_naturally(text, max_length=AIVIS_OPTIMAL_LENGTH):
-    """Split text at natural positions (for full reading)"""
-    if len(text) <= max_length:
+def _memo_sizeof(entry):
+    """Approximate bytes held by a memo entry (UTF-8 upper bound plus overhead)"""
+    result = entry[0]
+    if result is None:
+        chars = 0
+    elif isinstance(result, str):
+        chars = len(result)
+    else:
+        chars = sum(len(part) for part in result)
+    return 64 + 3 * chars
+
+
+def _memoize_text(cache):
+    """
+    Memoize a text function in an LRUCache, keyed by a BLAKE2b hash of the
+    text plus any extra arguments (v4.2). Consecutive turns often repeat
+    whole paragraphs, and a session switch re-reads recent messages.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(text, *args, **kwargs):
+            digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            key = (digest, args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry is None:
+                entry = (func(text, *args, **kwargs),)
+                cache.put(key, entry)
+            result = entry[0]
+            return list(result) if isinstance(result, list) else result
+        return wrapper
+    return decorator
+
+
+_narration_memo = LRUCache(NARRATION_MEMO_MAX_BYTES, sizeof=_memo_sizeof, name='NarrationMemo')
+_thinking_memo = LRUCache(NARRATION_MEMO_MAX_BYTES, sizeof=_memo_sizeof, name='ThinkingMemo')
+_chunk_memo = LRUCache(NARRATION_MEMO_MAX_BYTES, sizeof=_memo_sizeof, name='ChunkMemo')
+
+
+def narration_memo_stats():
+    """Hit/miss counters of the text memos, by function"""
+    return {
+        'process_text_for_narration': _narration_memo.stats(),
+        'process_thinking_for_narration': _thinking_memo.stats(),
+        'plan_chunks': _chunk_memo.stats(),
+    }
+
+# Thinking sentence-level English->Japanese patterns (first match per line wins)
+_THINKING_PATTERNS = [
+    (r"(?i)the user (?:wants?|is asking|asked)(?: me)? to\s+(.+)", "ユーザーの依頼"),
+    (r"(?i)i need to\s+(.+)", "必要な作業あり"),
+    (r"(?i)i should\s+(.+)", "方針を検討中"),
+    (r"(?i)let me (?:check|look|examine|verify|confirm)\b", "確認中"),
+    (r"(?i)let me (?:think|consider)\b", "考え中"),
+    (r"(?i)(?:first|next),?\s", "手順を整理中"),
+    (r"(?i)the (?:issue|problem|bug|error) is\b", "問題を特定中"),
+    (r"(?i)this (?:means|indicates|suggests)\b", "分析中"),
+    (r"(?i)i(?:'ll| will) (?:try|attempt)\b", "試行中"),
+    (r"(?i)looking at\b", "調査中"),
+    (r"(?i)i can see\b", "把握しました"),
+    (r"(?i)(?:so|therefore|in summary),?\s", "まとめ中"),
+    (r"(?i)(?:done|complete|finished)\b", "完了"),
+    (r"(?i)(?:fix|修正|update|更新)\b", "修正を検討中"),
+    (r"(?i)(?:now|then)\s+(?:i|let)\b", "次の手順へ"),
+]
+THINKING_FALLBACK_NARRATION = "考え中"
+
+# File extension -> human-friendly Japanese file type label
+_FILE_TYPE_LABELS = {
+    '.py': 'パイソンファイル', '.js': 'スクリプトファイル',
+    '.ts': 'スクリプトファイル', '.json': '設定ファイル',
+    '.md': 'ドキュメント', '.txt': 'テキストファイル',
+    '.log': 'ログファイル', '.yaml': '設定ファイル',
+    '.yml': '設定ファイル', '.toml': '設定ファイル',
+    '.html': 'ウェブページ', '.css': 'スタイルシート',
+    '.sh': 'シェルスクリプト', '.bat': 'バッチファイル',
+    '.csv': 'データファイル', '.xml': '設定ファイル',
+    '.jsonl': 'ログファイル', '.lock': 'ロックファイル',
+    '.pid': 'プロセスファイル', '.env': '環境設定',
+}
+FILE_TYPE_FALLBACK_LABEL = 'ファイル'
+
+# Keyword-based mapping for common tool description patterns
+_DESC_KEYWORDS = [
+    (['clone'], 'リポジトリをクローン'),
+    (['install', 'pip', 'npm', 'package'], 'パッケージをインストール'),
+    (['push'], 'リモートにプッシュ'),
+    (['pull'], 'リモートからプル'),
+    (['commit'], 'コミットを作成'),
+    (['merge'], 'ブランチをマージ'),
+    (['checkout', 'switch branch'], 'ブランチを切り替え'),
+    (['diff'], '差分を確認'),
+    (['log', 'history'], '履歴を確認'),
+    (['status'], 'ステータスを確認'),
+    (['start', 'launch', 'run', 'restart'], 'プロセスを起動'),
+    (['stop', 'kill', 'terminate'], 'プロセスを停止'),
+    (['verify', 'check', 'confirm', 'validate'], '確認'),
+    (['test'], 'テストを実行'),
+    (['build', 'compile'], 'ビルドを実行'),
+    (['search', 'find', 'scan', 'grep'], '検索'),
+    (['list'], '一覧を取得'),
+    (['save', 'write', 'create', 'generate'], '保存'),
+    (['read', 'load', 'fetch', 'get'], '読み込み'),
+    (['update', 'modify', 'edit', 'fix', 'patch'], '更新'),
+    (['delete', 'remove', 'clean'], '削除'),
+    (['debug'], 'デバッグ'),
+    (['deploy'], 'デプロイ'),
+    (['auth'], '認証を確認'),
+    (['privacy'], 'プライバシーを確認'),
+    (['format'], 'フォーマットを整理'),
+]
+
+# Bash fallback: infer the action from command content (checked in order)
+_BASH_COMMAND_NARRATIONS = [
+    (['git push'], "リモートにプッシュ"),
+    (['git pull'], "リモートからプル"),
+    (['git commit', 'git add'], "コミットを作成"),
+    (['git diff'], "差分を確認"),
+    (['git log'], "履歴を確認"),
+    (['git status'], "ステータスを確認"),
+    (['git clone'], "リポジトリをクローン"),
+    (['git '], "ギット操作を実行"),
+    (['pip '], "パッケージをインストール"),
+    (['npm ', 'yarn '], "パッケージをインストール"),
+    (['grep ', 'findstr'], "テキストを検索"),
+    (['taskkill', 'kill '], "プロセスを停止"),
+    (['tasklist', 'ps '], "プロセスを確認"),
+    (['curl ', 'wget '], "ネットワーク通信"),
+    (['python', 'node '], "スクリプトを実行"),
+    (['ls ', 'dir '], "ファイル一覧を取得"),
+    (['cat ', 'head ', 'tail '], "ファイルを確認"),
+    (['mkdir '], "フォルダを作成"),
+    (['rm ', 'del '], "ファイルを削除"),
+    (['cp ', 'mv '], "ファイルを移動"),
+    (['sleep '], "待機中"),
+    (['gh '], "ギットハブ操作"),
+]
+BASH_FALLBACK_NARRATION = "コマンドを実行"
+
+# File tools: narrated as "<file type label>を<action>"
+_FILE_TOOL_ACTIONS = {
+    'Read': '読み取り',
+    'Write': '作成',
+    'Edit': '編集',
+}
+
+# Other tools with a fixed narration
+_TOOL_NARRATIONS = {
+    'Glob': "ファイルを検索",
+    'Grep': "コード内を検索",
+    'Agent': "サブエージェントを起動",
+    'TodoWrite': "タスクを更新",
+    'Skill': "スキルを実行",
+    'WebSearch': "ウェブを検索",
+    'WebFetch': "ウェブページを取得",
+}
+
+# MCP and other tools matched by a substring of the (lowercased) tool name
+_TOOL_NAME_KEYWORDS = [
+    ('notion', "ノーションにアクセス"),
+    ('gmail', "メールを確認"),
+    ('preview', "プレビューを操作"),
+]
+TOOL_FALLBACK_NARRATION = "ツールを実行します"
+
+# Fixed announcements enqueued by the monitor
+NARRATION_NEW_SESSION = "新しいセッションが始まりました。"
+NARRATION_USER_INPUT = "受け取りました。"
+NARRATION_PERMISSION_DENIED = "ユーザーが操作を拒否しました。"
+
+# Chunk break characters for plan_chunks, by preference
+_SENTENCE_TERMINATORS = '。！？!?\n'
+_COMMA_TERMINATORS = '、，,'
+
+
+def _last_break(text, start, end, terminators, ascii_period=False):
+    """
+    Position just after the last terminator in text[start:end] (and any
+    whitespace following it, up to end), or None.
+    With ascii_period, '.' counts when followed by whitespace or the end.
+    """
+    pos = max(text.rfind(ch, start, end) for ch in terminators)
+    if ascii_period:
+        dot = text.rfind('.', max(start, pos + 1), end)
+        while dot >= 0 and not (dot + 1 == len(text) or text[dot + 1].isspace()):
+            dot = text.rfind('.', max(start, pos + 1), dot)
+        pos = max(pos, dot)
+    if pos < 0:
+        return None
+    cut = pos + 1
+    while cut < end and text[cut].isspace():
+        cut += 1
+    return cut
+
+
+def _first_break(text, start, end, terminators, ascii_period=False):
+    """
+    Position just after the first terminator in text[start:end] (and any
+    terminators or whitespace following it, up to end), or None.
+    """
+    found = [pos for pos in (text.find(ch, start, end) for ch in terminators) if pos >= 0]
+    if ascii_period:
+        dot = text.find('.', start, end)
+        while dot >= 0 and not (dot + 1 == len(text) or text[dot + 1].isspace()):
+            dot = text.find('.', dot + 1, end)
+        if dot >= 0:
+            found.append(dot)
+    if not found:
+        return None
+    cut = min(found) + 1
+    while cut < end and (text[cut].isspace() or text[cut] in terminators):
+        cut += 1
+    return cut
+
+
+def plan_chunks(text, first_length=FIRST_CHUNK_MAX_LENGTH, max_length=AIVIS_OPTIMAL_LENGTH):
+    """
+    Plan synthesis chunks for latency (v4.2)
+    The first chunk is about one clause so the first audio comes quickly.
+    Each later chunk may grow by 1 / RTF (engine seconds per audio second),
+    since it is synthesized while the previous one plays.
+    A chunk ends at the last sentence end within its budget (。！？!?,
+    newline, '.' before whitespace), else after the last comma, else at the
+    next break after the budget. No chunk is longer than
+    min(max_length, AIVIS_MAX_LENGTH); whitespace-only pieces are dropped.
+    """
+    limit = min(max_length, AIVIS_MAX_LENGTH)
+    if len(text) <= min(limit, max(CHUNK_PLAN_MIN_LENGTH, first_length)):
         return [text]
-    
+
+    return _plan_chunks(text, first_length, limit, chunk_growth())
+
+
+def chunk_growth():
+    """Factor by which each planned chunk may exceed the previous one's budget"""
+    rtf = synthesis_rtf()
+    growth = CHUNK_GROWTH_DEFAULT if rtf is None else 1.0 / max(rtf, 1e-3)
+    growth = min(CHUNK_GROWTH_MAX, max(CHUNK_GROWTH_MIN, growth))
+    # Rounded so the memo still hits while the RTF estimate drifts slightly
+    return round(growth, 1)
+
+
+def growth_phase_chunks(first_length=FIRST_CHUNK_MAX_LENGTH, max_length=AIVIS_OPTIMAL_LENGTH):
+    """Number of leading chunks plan_chunks sizes below its full budget"""
+    limit = min(max_length, AIVIS_MAX_LENGTH)
+    growth = chunk_growth()
+    count = 0
+    budget = min(first_length, limit)
+    while budget < limit:
+        count += 1
+        budget = min(limit, int(budget * growth))
+    return count
+
+
+@_memoize_text(_chunk_memo)
+def _plan_chunks(text, first_length, limit, growth):
+    """Chunks of text for a given growth factor (memoized part of plan_chunks)"""
     chunks = []
-    
-    # Split by paragraphs first
-    if '。。' in text:
-        paragraphs = text.split('。。')
-        current_chunk = ""
-        
-        for para in paragraphs:
-            if not para.strip():
-                continue
-            
-            if len(para) > max_length:
-                # Split by sentences
-                sentences = para.split('。')
-                for sent in sentences:
-                    if not sent.strip():
-                        continue
-                    
-                    if len(sent) > max_length:
-                        # Further split by commas
-                        parts = sent.split('、')
-                        for part in parts:
-                            if len(current_chunk) + len(part) < max_length:
-                                current_chunk += part + '、'
-                            else:
-                                if current_chunk:
-                                    chunks.append(current_chunk.rstrip('、'))
-                                current_chunk = part + '、'
-                    elif len(current_chunk) + len(sent) < max_length:
-                        current_chunk += sent + '。'
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk)
-                        current_chunk = sent + '。'
-            else:
-                if len(current_chunk) + len(para) < max_length:
-                    current_chunk += para + '。。'
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk)
-                    current_chunk = para + '。。'
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-    else:
-        # Split by sentences
-        sentences = text.split('。')
-        current_chunk = ""
-        
-        for sent in sentences:
-            if not sent.strip():
-                continue
-            
-            if len(current_chunk) + len(sent) < max_length:
-                current_chunk += sent + '。'
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sent + '。'
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-    
+    start = 0
+    budget = min(first_length, limit)
+    while len(text) - start > budget:
+        end = start + budget
+        cut = (_last_break(text, start, end, _SENTENCE_TERMINATORS, ascii_period=True)
+               or _last_break(text, start, end, _COMMA_TERMINATORS))
+        if cut is None:
+            # No break within the budget: run on to the next one, up to the limit
+            hard = min(len(text), start + limit)
+            cut = _first_break(text, end, hard, _SENTENCE_TERMINATORS + _COMMA_TERMINATORS,
+                               ascii_period=True) or hard
+        if text[start:cut].strip():
+            chunks.append(text[start:cut])
+        start = cut
+        budget = min(limit, int(budget * growth))
+    if text[start:].strip():
+        chunks.append(text[start:])
     return chunks
 
+
+@_memoize_text(_thinking_memo)
 def process_thinking_for_narration(thinking_text):
     """Convert thinking to clean Japanese narration (v4.1)
 
@@ -464,37 +2516,18 @@ def process_thinking_for_narration(thinking_text):
     # English thinking -> extract intent as Japanese
     lines = [l.strip() for l in text.split('\n') if l.strip()]
 
-    # Sentence-level English->Japanese patterns
-    _patterns = [
-        (r"(?i)the user (?:wants?|is asking|asked)(?: me)? to\s+(.+)", "ユーザーの依頼"),
-        (r"(?i)i need to\s+(.+)", "必要な作業あり"),
-        (r"(?i)i should\s+(.+)", "方針を検討中"),
-        (r"(?i)let me (?:check|look|examine|verify|confirm)\b", "確認中"),
-        (r"(?i)let me (?:think|consider)\b", "考え中"),
-        (r"(?i)(?:first|next),?\s", "手順を整理中"),
-        (r"(?i)the (?:issue|problem|bug|error) is\b", "問題を特定中"),
-        (r"(?i)this (?:means|indicates|suggests)\b", "分析中"),
-        (r"(?i)i(?:'ll| will) (?:try|attempt)\b", "試行中"),
-        (r"(?i)looking at\b", "調査中"),
-        (r"(?i)i can see\b", "把握しました"),
-        (r"(?i)(?:so|therefore|in summary),?\s", "まとめ中"),
-        (r"(?i)(?:done|complete|finished)\b", "完了"),
-        (r"(?i)(?:fix|修正|update|更新)\b", "修正を検討中"),
-        (r"(?i)(?:now|then)\s+(?:i|let)\b", "次の手順へ"),
-    ]
-
     # Extract unique Japanese action labels from patterns that match
     actions = []
     seen = set()
     for line in lines[:15]:
-        for pat, action_jp in _patterns:
+        for pat, action_jp in _THINKING_PATTERNS:
             if re.search(pat, line) and action_jp not in seen:
                 actions.append(action_jp)
                 seen.add(action_jp)
                 break
 
     if not actions:
-        return "考え中"
+        return THINKING_FALLBACK_NARRATION
 
     # Join unique actions, max 3
     result = '。'.join(actions[:3])
@@ -504,19 +2537,7 @@ def process_thinking_for_narration(thinking_text):
 def _file_type_label(filepath):
     """Return human-friendly Japanese file type label from extension"""
     ext = os.path.splitext(filepath)[1].lower() if filepath else ''
-    _ext_map = {
-        '.py': 'パイソンファイル', '.js': 'スクリプトファイル',
-        '.ts': 'スクリプトファイル', '.json': '設定ファイル',
-        '.md': 'ドキュメント', '.txt': 'テキストファイル',
-        '.log': 'ログファイル', '.yaml': '設定ファイル',
-        '.yml': '設定ファイル', '.toml': '設定ファイル',
-        '.html': 'ウェブページ', '.css': 'スタイルシート',
-        '.sh': 'シェルスクリプト', '.bat': 'バッチファイル',
-        '.csv': 'データファイル', '.xml': '設定ファイル',
-        '.jsonl': 'ログファイル', '.lock': 'ロックファイル',
-        '.pid': 'プロセスファイル', '.env': '環境設定',
-    }
-    return _ext_map.get(ext, 'ファイル')
+    return _FILE_TYPE_LABELS.get(ext, FILE_TYPE_FALLBACK_LABEL)
 
 
 def _desc_to_japanese(desc):
@@ -524,36 +2545,7 @@ def _desc_to_japanese(desc):
     if not desc:
         return None
     d = desc.lower().strip()
-    # Keyword-based mapping for common description patterns
-    _kw = [
-        (['clone'], 'リポジトリをクローン'),
-        (['install', 'pip', 'npm', 'package'], 'パッケージをインストール'),
-        (['push'], 'リモートにプッシュ'),
-        (['pull'], 'リモートからプル'),
-        (['commit'], 'コミットを作成'),
-        (['merge'], 'ブランチをマージ'),
-        (['checkout', 'switch branch'], 'ブランチを切り替え'),
-        (['diff'], '差分を確認'),
-        (['log', 'history'], '履歴を確認'),
-        (['status'], 'ステータスを確認'),
-        (['start', 'launch', 'run', 'restart'], 'プロセスを起動'),
-        (['stop', 'kill', 'terminate'], 'プロセスを停止'),
-        (['verify', 'check', 'confirm', 'validate'], '確認'),
-        (['test'], 'テストを実行'),
-        (['build', 'compile'], 'ビルドを実行'),
-        (['search', 'find', 'scan', 'grep'], '検索'),
-        (['list'], '一覧を取得'),
-        (['save', 'write', 'create', 'generate'], '保存'),
-        (['read', 'load', 'fetch', 'get'], '読み込み'),
-        (['update', 'modify', 'edit', 'fix', 'patch'], '更新'),
-        (['delete', 'remove', 'clean'], '削除'),
-        (['debug'], 'デバッグ'),
-        (['deploy'], 'デプロイ'),
-        (['auth'], '認証を確認'),
-        (['privacy'], 'プライバシーを確認'),
-        (['format'], 'フォーマットを整理'),
-    ]
-    for keywords, jp in _kw:
+    for keywords, jp in _DESC_KEYWORDS:
         if any(kw in d for kw in keywords):
             return jp
     return None
@@ -576,445 +2568,753 @@ def process_tool_use_for_narration(tool_name, tool_input):
         if jp_desc:
             return jp_desc
         # Fallback: infer from command content
-        if 'git push' in cmd:
-            return "リモートにプッシュ"
-        if 'git pull' in cmd:
-            return "リモートからプル"
-        if 'git commit' in cmd or 'git add' in cmd:
-            return "コミットを作成"
-        if 'git diff' in cmd:
-            return "差分を確認"
-        if 'git log' in cmd:
-            return "履歴を確認"
-        if 'git status' in cmd:
-            return "ステータスを確認"
-        if 'git clone' in cmd:
-            return "リポジトリをクローン"
-        if 'git ' in cmd:
-            return "ギット操作を実行"
-        if 'pip ' in cmd:
-            return "パッケージをインストール"
-        if 'npm ' in cmd or 'yarn ' in cmd:
-            return "パッケージをインストール"
-        if 'grep ' in cmd or 'findstr' in cmd:
-            return "テキストを検索"
-        if 'taskkill' in cmd or 'kill ' in cmd:
-            return "プロセスを停止"
-        if 'tasklist' in cmd or 'ps ' in cmd:
-            return "プロセスを確認"
-        if 'curl ' in cmd or 'wget ' in cmd:
-            return "ネットワーク通信"
-        if 'python' in cmd or 'node ' in cmd:
-            return "スクリプトを実行"
-        if 'ls ' in cmd or 'dir ' in cmd:
-            return "ファイル一覧を取得"
-        if 'cat ' in cmd or 'head ' in cmd or 'tail ' in cmd:
-            return "ファイルを確認"
-        if 'mkdir ' in cmd:
-            return "フォルダを作成"
-        if 'rm ' in cmd or 'del ' in cmd:
-            return "ファイルを削除"
-        if 'cp ' in cmd or 'mv ' in cmd:
-            return "ファイルを移動"
-        if 'sleep ' in cmd:
-            return "待機中"
-        if 'gh ' in cmd:
-            return "ギットハブ操作"
-        return "コマンドを実行"
-
-    if tool_name == 'Read':
-        fp = tool_input.get('file_path', '')
-        return f"{_file_type_label(fp)}を読み取り"
+        for needles, narration in _BASH_COMMAND_NARRATIONS:
+            if any(needle in cmd for needle in needles):
+                return narration
+        return BASH_FALLBACK_NARRATION
 
-    if tool_name == 'Write':
+    if tool_name in _FILE_TOOL_ACTIONS:
         fp = tool_input.get('file_path', '')
-        return f"{_file_type_label(fp)}を作成"
-
-    if tool_name == 'Edit':
-        fp = tool_input.get('file_path', '')
-        return f"{_file_type_label(fp)}を編集"
-
-    if tool_name == 'Glob':
-        return "ファイルを検索"
-
-    if tool_name == 'Grep':
-        return "コード内を検索"
-
-    if tool_name == 'Agent':
-        return "サブエージェントを起動"
-
-    if tool_name == 'TodoWrite':
-        return "タスクを更新"
-
-    if tool_name == 'Skill':
-        return "スキルを実行"
-
-    if tool_name == 'WebSearch':
-        return "ウェブを検索"
-
-    if tool_name == 'WebFetch':
-        return "ウェブページを取得"
+        return f"{_file_type_label(fp)}を{_FILE_TOOL_ACTIONS[tool_name]}"
+
+    if tool_name in _TOOL_NARRATIONS:
+        return _TOOL_NARRATIONS[tool_name]
+
+    for keyword, narration in _TOOL_NAME_KEYWORDS:
+        if keyword in tool_name.lower():
+            return narration
+
+    return TOOL_FALLBACK_NARRATION
+
+# Terms translated BEFORE identifier removal, so known English words are
+# read in Japanese instead of deleted (v4.0)
+_EARLY_TERM_REPLACEMENTS = {
+    'operation': '操作', 'enqueue': 'エンキュー', 'Desktop': 'デスクトップ',
+    'function': '関数', 'variable': '変数', 'parameter': 'パラメーター',
+    'argument': '引数', 'callback': 'コールバック', 'listener': 'リスナー',
+    'handler': 'ハンドラー', 'generate': '生成', 'process': 'プロセス',
+    'monitor': 'モニター', 'session': 'セッション', 'message': 'メッセージ',
+    'response': '応答', 'narration': '読み上げ', 'thinking': '思考',
+    'assistant': 'アシスタント', 'permission': '許可', 'detection': '検出',
+    'duplicate': '重複', 'prevention': '防止', 'processing': '処理',
+    'monitoring': '監視', 'switching': '切り替え', 'connection': '接続',
+    'compatible': '互換', 'compatibility': '互換性',
+    'notification': '通知', 'confirmation': '確認',
+    'initialize': '初期化', 'configure': '設定', 'implement': '実装',
+    'replacement': '置換', 'conversion': '変換',
+}
+
+# Technical terms converted to more natural Japanese
+_TERM_REPLACEMENTS = {
+    'TODO': 'タスク',
+    'API': 'エーピーアイ',
+    'URL': 'アドレス',
+    'JSON': 'ジェイソン',
+    'JSONL': 'ジェイソンエル',
+    'HTML': 'エイチティーエムエル',
+    'CSS': 'スタイルシート',
+    'CLI': 'コマンドライン',
+    'Desktop': 'デスクトップ',
+    'ID': 'アイディー',
+    'PID': 'プロセスアイディー',
+    'OK': 'オーケー',
+    'NG': 'エヌジー',
+    'FIFO': 'ファイフォ',
+    # Common development terms
+    'error': 'エラー',
+    'warning': '警告',
+    'info': '情報',
+    'debug': 'デバッグ',
+    'git': 'ギット',
+    'commit': 'コミット',
+    'push': 'プッシュ',
+    'pull': 'プル',
+    'branch': 'ブランチ',
+    'file': 'ファイル',
+    'folder': 'フォルダ',
+    'update': '更新',
+    'create': '作成',
+    'delete': '削��',
+    'edit': '編集',
+    'read': '読み取り',
+    'write': '書き込み',
+    'install': 'インストール',
+    'clone': 'クローン',
+    'process': 'プロセス',
+    'queue': 'キュー',
+    'operation': '操作',
+    'message': 'メッセージ',
+    'role': 'ロール',
+    'content': 'コンテンツ',
+    'assistant': 'アシスタント',
+    'user': 'ユーザー',
+    'tool': 'ツール',
+    'result': '結果',
+    'type': 'タイプ',
+    'thinking': '思考',
+    'narration': '読み上げ',
+    'volume': '音量',
+    'script': 'スクリプト',
+    'code': 'コード',
+    'version': 'バージョン',
+    'config': '設定',
+    'log': 'ログ',
+    'path': 'パス',
+    'pattern': 'パターン',
+    'response': '応答',
+    'request': 'リクエスト',
+    'chars': '文字',
+    'string': '文字列',
+    'permission': '許可',
+    'denied': '拒否',
+    'rejected': '拒否',
+    'operation': '操作',
+    'enqueue': 'エンキュー',
+    'dequeue': 'デキュー',
+    'Desktop': 'デスクトップ',
+    'monitor': 'モニター',
+    'session': 'セッション',
+    'startup': 'スタートアップ',
+    'shutdown': 'シャットダウン',
+    'thread': 'スレッド',
+    'worker': 'ワーカー',
+    'timeout': 'タイムアウト',
+    'retry': 'リトライ',
+    'chunk': 'チャンク',
+    'hash': 'ハッシュ',
+    'token': 'トークン',
+    'parser': 'パーサー',
+    'plugin': 'プラグイン',
+    'callback': 'コールバック',
+    'input': '入力',
+    'output': '出力',
+    'function': '関数',
+    'method': 'メソッド',
+    'class': 'クラス',
+    'variable': '変数',
+    'parameter': 'パラメーター',
+    'argument': '引数',
+    'return': '戻り値',
+    'module': 'モジュール',
+    'import': 'インポート',
+    'export': 'エクスポート',
+    'test': 'テスト',
+    'build': 'ビルド',
+    'deploy': 'デプロイ',
+    'server': 'サーバー',
+    'client': 'クライアント',
+    'agent': 'エージェント',
+    'hook': 'フック',
+    'event': 'イベント',
+    'handler': 'ハンドラー',
+    'listener': 'リスナー',
+    'stream': 'ストリーム',
+    'buffer': 'バッファー',
+    'cache': 'キャッシュ',
+    'stack': 'スタック',
+    'queue': 'キュー',
+    'array': '配列',
+    'object': 'オブジェクト',
+    'null': 'ヌル',
+    'true': 'トゥルー',
+    'false': 'フォルス',
+    'status': 'ステータス',
+    'check': 'チェック',
+    'verify': '検証',
+    'validate': '検証',
+    'parse': '解析',
+    'render': 'レンダリング',
+    'compile': 'コンパイル',
+    'execute': '実行',
+    'launch': '起動',
+    'stop': '停止',
+    'start': '開始',
+    'run': '実行',
+    'running': '実行中',
+    'failed': '失敗',
+    'success': '成功',
+    'complete': '完了',
+    'pending': '保留中',
+    'active': 'アクティブ',
+    'enabled': '有効',
+    'disabled': '無効',
+}
+
+# v3.1.6: Uppercase acronyms not in the dictionary are spelled out in katakana
+_ALPHABET_KATAKANA = {
+    'A': 'エー', 'B': 'ビー', 'C': 'シー', 'D': 'ディー',
+    'E': 'イー', 'F': 'エフ', 'G': 'ジー', 'H': 'エイチ',
+    'I': 'アイ', 'J': 'ジェイ', 'K': 'ケー', 'L': 'エル',
+    'M': 'エム', 'N': 'エヌ', 'O': 'オー', 'P': 'ピー',
+    'Q': 'キュー', 'R': 'アール', 'S': 'エス', 'T': 'ティー',
+    'U': 'ユー', 'V': 'ブイ', 'W': 'ダブリュー', 'X': 'エックス',
+    'Y': 'ワイ', 'Z': 'ゼット'
+}
+
+# File extensions read as a Japanese suffix ("config.json" -> "config設定ファイル")
+_EXTENSION_LABELS = [
+    ('py', 'ファイル'), ('js', 'スクリプト'), ('json', '設定ファイル'),
+    ('md', '文書'), ('txt', 'テキスト'), ('log', 'ログ'),
+]
+
+_NARRATION_EMOJIS = ['✅', '❌', '⚠️', '📊', '🎯', '💡', '🔧', '📝']
+
+
+class NarrationNormalizer:
+    """
+    Convert assistant text for natural narration (v4.2)
+    All patterns and tables are compiled once at construction. normalize()
+    applies the same passes in the same order as the original
+    process_text_for_narration, skipping passes whose required characters
+    are absent from the current text (e.g. every English pass for text
+    with no ASCII letters).
+    """
 
-    if 'notion' in tool_name.lower():
-        return "ノーションにアクセス"
+    def __init__(self, early_terms=_EARLY_TERM_REPLACEMENTS, terms=_TERM_REPLACEMENTS):
+        # Terms are matched case-insensitively and only as a whole run of
+        # ASCII letters (a lookaround boundary that works with Japanese, not
+        # just \b), so each run is replaced by one dict lookup in a single scan
+        self._early_terms = {old.lower(): new for old, new in early_terms.items()}
+        self._terms = {old.lower(): new for old, new in terms.items()}
+        self._letter_run = re.compile(r'[a-zA-Z]+', re.IGNORECASE)
+        # Non-ASCII letters IGNORECASE treats as ASCII ones
+        self._case_fold = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's', 'K': 'k'})
+        self._alphabet = str.maketrans(_ALPHABET_KATAKANA)
+        self._brackets = str.maketrans({c: '。' for c in '（(）)「『」』'})
+
+        self._code_block = re.compile(r'\n*```[\s\S]*?```\n*')
+        self._long_inline_code = re.compile(r'`[^`]{40,}`')
+        self._inline_code = re.compile(r'`([^`]+)`')
+        self._url = re.compile(r'https?://\S+')
+        self._windows_path = re.compile(r'[A-Z]:\\[^\s,。、]+')
+        self._unix_path = re.compile(r'/[a-z][^\s,。、]{5,}')
+        self._ascii_letter = re.compile(r'[a-zA-Z]')
+        self._snake_identifier = re.compile(r'\b[a-z_][a-z0-9_]{8,}\b')
+        self._camel_identifier = re.compile(r'\b[a-z]+[A-Z][a-zA-Z]+\b')
+        self._extensions = [
+            ('.' + ext, re.compile(rf'(\w+)\.{ext}\b'), rf'\1{label}')
+            for ext, label in _EXTENSION_LABELS
+        ]
+        self._rules = re.compile(r'[=\-─━]{3,}')
+        self._hashes = re.compile(r'[#]{2,}')
+        self._stars = re.compile(r'[\*]{2,}')
+        self._bullet = re.compile(r'^- (.+?)$', re.MULTILINE)
+        self._numbered = re.compile(r'(\d+)\.(\s*)')
+        self._paragraph_break = re.compile(r'\n\n+')
+        self._session_stamp = re.compile(r'SESSION_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})_\d+')
+        self._iso_datetime = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})')
+        self._datetime = re.compile(r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})')
+        self._time = re.compile(r'(\d{2}):(\d{2}):(\d{2})')
+        self._acronym = re.compile(r'\b[A-Z]{2,}\b')
+        self._long_word = re.compile(r'\b[a-zA-Z]{4,}\b')
+        self._short_word = re.compile(r'(?<![ァ-ヶー])\b[a-zA-Z]{1,3}\b(?![ァ-ヶー])')
+        self._periods = re.compile(r'。+')
+        self._commas = re.compile(r'、+')
+        self._whitespace = re.compile(r'\s+')
+        self._leading_punctuation = re.compile(r'^[、。\s]+')
+
+    def _replace_terms(self, text, terms):
+        """Apply a term table in one scan (case-insensitive, JP-boundary-aware)"""
+        def lookup(match):
+            word = match.group()
+            return terms.get(word.translate(self._case_fold).lower(), word)
+
+        return self._letter_run.sub(lookup, text)
+
+    def normalize(self, text):
+        # Process code blocks with surrounding whitespace
+        if '```' in text:
+            text = self._code_block.sub('。コード部分があります。', text)
+
+        # v4.0: Remove inline code backticks and clean their contents
+        if '`' in text:
+            # Long code fragments -> just say "コード"
+            text = self._long_inline_code.sub('コード部分', text)
+            # Short inline code -> remove backticks, let term replacement handle it
+            text = self._inline_code.sub(r'\1', text)
+
+        # v4.0: Remove URLs
+        if 'http' in text:
+            text = self._url.sub('', text)
+
+        # v4.0: Remove file paths entirely (user requested no filenames/dirs)
+        if ':\\' in text:
+            text = self._windows_path.sub('', text)
+        if '/' in text:
+            text = self._unix_path.sub('', text)
+
+        # No pass below introduces ASCII letters
+        has_letters = self._ascii_letter.search(text) is not None
+
+        if has_letters:
+            # v4.0: Apply term dictionary BEFORE identifier removal
+            text = self._replace_terms(text, self._early_terms)
+
+        # v4.0: Remove standalone English identifiers (snake_case, camelCase)
+        if has_letters or '_' in text:
+            text = self._snake_identifier.sub('', text)
+        if has_letters:
+            text = self._camel_identifier.sub('', text)
+
+            # Convert file extensions to Japanese (more natural)
+            if '.' in text:
+                for suffix, pattern, repl in self._extensions:
+                    if suffix in text:
+                        text = pattern.sub(repl, text)
+
+        # Remove emojis and symbols
+        if not text.isascii():
+            for emoji in _NARRATION_EMOJIS:
+                text = text.replace(emoji, '')
+
+        # Remove decoration symbols
+        text = self._rules.sub('', text)
+        if '##' in text:
+            text = self._hashes.sub('', text)
+        if '**' in text:
+            text = self._stars.sub('', text)
+
+        # Process bullet points and numbering lists (v3.1.6: fixed)
+        # Remove bullet markers
+        if '- ' in text:
+            text = self._bullet.sub(r'\1', text)
+        # Convert numbered lists to natural reading format (1. -> 1、)
+        if '.' in text:
+            text = self._numbered.sub(r'\1、', text)
+
+        # Improved line break processing
+        if '\n' in text:
+            # Double line breaks become single periods (paragraph breaks)
+            text = self._paragraph_break.sub('。', text)
+            # Single line breaks become commas (line breaks within paragraphs)
+            text = text.replace('\n', '、')
+
+        # v3.1.5: Convert brackets to periods for clearer audio separation
+        text = text.translate(self._brackets)
+
+        # v3.1.6: Process datetime formats for natural reading
+        # SESSION_YYYYMMDD_HHMMSS_NNNNNN format
+        if 'SESSION_' in text:
+            text = self._session_stamp.sub(
+                lambda m: f'セッション {int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
+                text
+            )
+        if '-' in text:
+            # ISO format YYYY-MM-DDTHH:MM:SS
+            text = self._iso_datetime.sub(
+                lambda m: f'{int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
+                text
+            )
+            # Normal datetime format YYYY-MM-DD HH:MM:SS
+            text = self._datetime.sub(
+                lambda m: f'{int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
+                text
+            )
+        # Time only HH:MM:SS
+        if ':' in text:
+            text = self._time.sub(
+                lambda m: f'{int(m.group(1))}時{int(m.group(2))}分{int(m.group(3))}秒',
+                text
+            )
+
+        if has_letters:
+            # Convert technical terms to more natural Japanese
+            text = self._replace_terms(text, self._terms)
+
+            # v3.1.6: Convert sequences of 2 or more uppercase letters to katakana
+            text = self._acronym.sub(lambda m: m.group(0).translate(self._alphabet), text)
+
+            # v4.0: Remove remaining English words that weren't in the dictionary
+            # Remove isolated English words (4+ chars remaining after replacements)
+            text = self._long_word.sub('', text)
+            # Remove very short leftovers (1-3 letter English fragments)
+            text = self._short_word.sub('', text)
+
+        # Clean up consecutive punctuation
+        text = self._periods.sub('。', text)  # Multiple periods to single
+        text = self._commas.sub('、', text)  # Multiple commas to single
+        text = text.replace('。、', '。')  # Period followed by comma to just period
+        text = text.replace('、。', '。')  # Comma followed by period to just period
+        text = self._whitespace.sub(' ', text)
+        # Remove leading/trailing punctuation artifacts
+        text = self._leading_punctuation.sub('', text)
+
+        return text.strip()
+
+
+_narration_normalizer = NarrationNormalizer()
+
+
+@_memoize_text(_narration_memo)
+def process_text_for_narration(text):
+    """Convert text for natural narration experience (v4.0: enhanced Japanese)"""
+    return _narration_normalizer.normalize(text)
 
-    if 'gmail' in tool_name.lower():
-        return "メールを確認"
 
-    if 'preview' in tool_name.lower():
-        return "プレビューを操作"
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\n+')
 
-    return "ツールを実行します"
 
-def process_text_for_narration(text):
-    """Convert text for natural narration experience (v4.0: enhanced Japanese)"""
-    # Process code blocks with surrounding whitespace
-    text = re.sub(r'\n*```[\s\S]*?```\n*', '。コード部分があります。', text)
-
-    # v4.0: Remove inline code backticks and clean their contents
-    # Long code fragments -> just say "コード"
-    text = re.sub(r'`[^`]{40,}`', 'コード部分', text)
-    # Short inline code -> remove backticks, let term replacement handle it
-    text = re.sub(r'`([^`]+)`', r'\1', text)
-
-    # v4.0: Remove URLs
-    text = re.sub(r'https?://\S+', '', text)
-
-    # v4.0: Remove file paths entirely (user requested no filenames/dirs)
-    text = re.sub(r'[A-Z]:\\[^\s,。、]+', '', text)
-    text = re.sub(r'/[a-z][^\s,。、]{5,}', '', text)
-
-    # v4.0: Apply term dictionary BEFORE identifier removal
-    # so known English words get translated instead of deleted
-    _early_replacements = {
-        'operation': '操作', 'enqueue': 'エンキュー', 'Desktop': 'デスクトップ',
-        'function': '関数', 'variable': '変数', 'parameter': 'パラメーター',
-        'argument': '引数', 'callback': 'コールバック', 'listener': 'リスナー',
-        'handler': 'ハンドラー', 'generate': '生成', 'process': 'プロセス',
-        'monitor': 'モニター', 'session': 'セッション', 'message': 'メッセージ',
-        'response': '応答', 'narration': '読み上げ', 'thinking': '思考',
-        'assistant': 'アシスタント', 'permission': '許可', 'detection': '検出',
-        'duplicate': '重複', 'prevention': '防止', 'processing': '処理',
-        'monitoring': '監視', 'switching': '切り替え', 'connection': '接続',
-        'compatible': '互換', 'compatibility': '互換性',
-        'notification': '通知', 'confirmation': '確認',
-        'initialize': '初期化', 'configure': '設定', 'implement': '実装',
-        'replacement': '置換', 'conversion': '変換',
-    }
-    for old, new in _early_replacements.items():
-        # Use lookaround that works with Japanese characters (not just \b)
-        text = re.sub(rf'(?<![a-zA-Z]){old}(?![a-zA-Z])', new, text, flags=re.IGNORECASE)
-
-    # v4.0: Remove standalone English identifiers (snake_case, camelCase)
-    text = re.sub(r'\b[a-z_][a-z0-9_]{8,}\b', '', text)
-    text = re.sub(r'\b[a-z]+[A-Z][a-zA-Z]+\b', '', text)
-
-    # Convert file extensions to Japanese (more natural)
-    text = re.sub(r'(\w+)\.py\b', r'\1ファイル', text)
-    text = re.sub(r'(\w+)\.js\b', r'\1スクリプト', text)
-    text = re.sub(r'(\w+)\.json\b', r'\1設定ファイル', text)
-    text = re.sub(r'(\w+)\.md\b', r'\1文書', text)
-    text = re.sub(r'(\w+)\.txt\b', r'\1テキスト', text)
-    text = re.sub(r'(\w+)\.log\b', r'\1ログ', text)
-    
-    # Remove emojis and symbols
-    emojis = ['✅', '❌', '⚠️', '📊', '🎯', '💡', '🔧', '📝']
-    for emoji in emojis:
-        text = text.replace(emoji, '')
-    
-    # Remove decoration symbols
-    text = re.sub(r'[=\-─━]{3,}', '', text)
-    text = re.sub(r'[#]{2,}', '', text)
-    text = re.sub(r'[\*]{2,}', '', text)
-    
-    # Process bullet points and numbering lists (v3.1.6: fixed)
-    # Remove bullet markers
-    text = re.sub(r'^- (.+?)$', r'\1', text, flags=re.MULTILINE)
-    # Convert numbered lists to natural reading format (1. -> 1、)
-    # v3.1.6: More flexible pattern that works with indents and inline
-    text = re.sub(r'(\d+)\.(\s*)', r'\1、', text)
-    
-    # Improved line break processing
-    # Double line breaks become single periods (paragraph breaks)
-    text = re.sub(r'\n\n+', '。', text)
-    # Single line breaks become commas (line breaks within paragraphs)
-    text = re.sub(r'\n', '、', text)
-    
-    # v3.1.5: Convert brackets to periods for clearer audio separation
-    text = re.sub(r'[（(]', '。', text)
-    text = re.sub(r'[）)]', '。', text)
-    text = re.sub(r'[「『]', '。', text)
-    text = re.sub(r'[」』]', '。', text)
-    
-    # v3.1.6: Process datetime formats for natural reading
-    # SESSION_YYYYMMDD_HHMMSS_NNNNNN format
-    text = re.sub(
-        r'SESSION_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})_\d+',
-        lambda m: f'セッション {int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
-        text
-    )
-    
-    # ISO format YYYY-MM-DDTHH:MM:SS
-    text = re.sub(
-        r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})',
-        lambda m: f'{int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
-        text
-    )
-    
-    # Normal datetime format YYYY-MM-DD HH:MM:SS
-    text = re.sub(
-        r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})',
-        lambda m: f'{int(m.group(1))}年{int(m.group(2))}月{int(m.group(3))}日 {int(m.group(4))}時{int(m.group(5))}分{int(m.group(6))}秒',
-        text
-    )
-    
-    # Time only HH:MM:SS
-    text = re.sub(
-        r'(\d{2}):(\d{2}):(\d{2})',
-        lambda m: f'{int(m.group(1))}時{int(m.group(2))}分{int(m.group(3))}秒',
-        text
-    )
-    
-    # Convert technical terms to more natural Japanese
-    replacements = {
-        'TODO': 'タスク',
-        'API': 'エーピーアイ',
-        'URL': 'アドレス',
-        'JSON': 'ジェイソン',
-        'JSONL': 'ジェイソンエル',
-        'HTML': 'エイチティーエムエル',
-        'CSS': 'スタイルシート',
-        'CLI': 'コマンドライン',
-        'Desktop': 'デスクトップ',
-        'ID': 'アイディー',
-        'PID': 'プロセスアイディー',
-        'OK': 'オーケー',
-        'NG': 'エヌジー',
-        'FIFO': 'ファイフォ',
-        # Common development terms
-        'error': 'エラー',
-        'warning': '警告',
-        'info': '情報',
-        'debug': 'デバッグ',
-        'git': 'ギット',
-        'commit': 'コミット',
-        'push': 'プッシュ',
-        'pull': 'プル',
-        'branch': 'ブランチ',
-        'file': 'ファイル',
-        'folder': 'フォルダ',
-        'update': '更新',
-        'create': '作成',
-        'delete': '削��',
-        'edit': '編集',
-        'read': '読み取り',
-        'write': '書き込み',
-        'install': 'インストール',
-        'clone': 'クローン',
-        'process': 'プロセス',
-        'queue': 'キュー',
-        'operation': '操作',
-        'message': 'メッセージ',
-        'role': 'ロール',
-        'content': 'コンテンツ',
-        'assistant': 'アシスタント',
-        'user': 'ユーザー',
-        'tool': 'ツール',
-        'result': '結果',
-        'type': 'タイプ',
-        'thinking': '思考',
-        'narration': '読み上げ',
-        'volume': '音量',
-        'script': 'スクリプト',
-        'code': 'コード',
-        'version': 'バージョン',
-        'config': '設定',
-        'log': 'ログ',
-        'path': 'パス',
-        'pattern': 'パターン',
-        'response': '応答',
-        'request': 'リクエスト',
-        'chars': '文字',
-        'string': '文字列',
-        'permission': '許可',
-        'denied': '拒否',
-        'rejected': '拒否',
-        'operation': '操作',
-        'enqueue': 'エンキュー',
-        'dequeue': 'デキュー',
-        'Desktop': 'デスクトップ',
-        'monitor': 'モニター',
-        'session': 'セッション',
-        'startup': 'スタートアップ',
-        'shutdown': 'シャットダウン',
-        'thread': 'スレッド',
-        'worker': 'ワーカー',
-        'timeout': 'タイムアウト',
-        'retry': 'リトライ',
-        'chunk': 'チャンク',
-        'hash': 'ハッシュ',
-        'token': 'トークン',
-        'parser': 'パーサー',
-        'plugin': 'プラグイン',
-        'callback': 'コールバック',
-        'input': '入力',
-        'output': '出力',
-        'function': '関数',
-        'method': 'メソッド',
-        'class': 'クラス',
-        'variable': '変数',
-        'parameter': 'パラメーター',
-        'argument': '引数',
-        'return': '戻り値',
-        'module': 'モジュール',
-        'import': 'インポート',
-        'export': 'エクスポート',
-        'test': 'テスト',
-        'build': 'ビルド',
-        'deploy': 'デプロイ',
-        'server': 'サーバー',
-        'client': 'クライアント',
-        'agent': 'エージェント',
-        'hook': 'フック',
-        'event': 'イベント',
-        'handler': 'ハンドラー',
-        'listener': 'リスナー',
-        'stream': 'ストリーム',
-        'buffer': 'バッファー',
-        'cache': 'キャッシュ',
-        'stack': 'スタック',
-        'queue': 'キュー',
-        'array': '配列',
-        'object': 'オブジェクト',
-        'null': 'ヌル',
-        'true': 'トゥルー',
-        'false': 'フォルス',
-        'status': 'ステータス',
-        'check': 'チェック',
-        'verify': '検証',
-        'validate': '検証',
-        'parse': '解析',
-        'render': 'レンダリング',
-        'compile': 'コンパイル',
-        'execute': '実行',
-        'launch': '起動',
-        'stop': '停止',
-        'start': '開始',
-        'run': '実行',
-        'running': '実行中',
-        'failed': '失敗',
-        'success': '成功',
-        'complete': '完了',
-        'pending': '保留中',
-        'active': 'アクティブ',
-        'enabled': '有効',
-        'disabled': '無効',
-    }
-    
-    # Apply replacements (case-insensitive, JP-boundary-aware)
-    for old, new in replacements.items():
-        text = re.sub(rf'(?<![a-zA-Z]){old}(?![a-zA-Z])', new, text, flags=re.IGNORECASE)
-    
-    # v3.1.6: Convert uppercase alphabet sequences to katakana
-    # This handles acronyms not in the dictionary
-    def convert_uppercase_to_katakana(match):
-        alphabet_dict = {
-            'A': 'エー', 'B': 'ビー', 'C': 'シー', 'D': 'ディー',
-            'E': 'イー', 'F': 'エフ', 'G': 'ジー', 'H': 'エイチ',
-            'I': 'アイ', 'J': 'ジェイ', 'K': 'ケー', 'L': 'エル',
-            'M': 'エム', 'N': 'エヌ', 'O': 'オー', 'P': 'ピー',
-            'Q': 'キュー', 'R': 'アール', 'S': 'エス', 'T': 'ティー',
-            'U': 'ユー', 'V': 'ブイ', 'W': 'ダブリュー', 'X': 'エックス',
-            'Y': 'ワイ', 'Z': 'ゼット'
-        }
-        result = ''
-        for char in match.group(0):
-            if char in alphabet_dict:
-                result += alphabet_dict[char]
-            else:
-                result += char
-        return result
-    
-    # Convert sequences of 2 or more uppercase letters
-    text = re.sub(r'\b[A-Z]{2,}\b', convert_uppercase_to_katakana, text)
-
-    # v4.0: Remove remaining English words that weren't in the dictionary
-    # Remove isolated English words (4+ chars remaining after replacements)
-    text = re.sub(r'\b[a-zA-Z]{4,}\b', '', text)
-    # Remove very short leftovers (1-3 letter English fragments)
-    text = re.sub(r'(?<![ァ-ヶー])\b[a-zA-Z]{1,3}\b(?![ァ-ヶー])', '', text)
-
-    # Clean up consecutive punctuation
-    text = re.sub(r'。+', '。', text)  # Multiple periods to single
-    text = re.sub(r'、+', '、', text)  # Multiple commas to single
-    text = re.sub(r'。、', '。', text)  # Period followed by comma to just period
-    text = re.sub(r'、。', '。', text)  # Comma followed by period to just period
-    text = re.sub(r'\s+', ' ', text)
-    # Remove leading/trailing punctuation artifacts
-    text = re.sub(r'^[、。\s]+', '', text)
-
-    return text.strip()
+def iter_narration_segments(text):
+    """
+    Normalize text paragraph by paragraph (v4.2)
+    Yields (segment, pause_after) as soon as each paragraph is ready, so the
+    first one can be synthesized while the rest is still being processed.
+    Paragraphs break at blank lines, except inside ``` code fences.
+    pause_after is the paragraph pause, or 0.0 after the last spoken
+    paragraph; each segment is held until the next non-empty one is known.
+    """
+    held = None
+    start = 0
+    for match in _PARAGRAPH_BREAK_RE.finditer(text):
+        paragraph = text[start:match.start()]
+        if paragraph.count('```') % 2:
+            continue  # Blank line inside a code fence
+        start = match.end()
+        segment = process_text_for_narration(paragraph)
+        if segment:
+            if held is not None:
+                yield held, NARRATION_PAUSE_PARAGRAPH
+            held = segment
+    segment = process_text_for_narration(text[start:])
+    if segment:
+        if held is not None:
+            yield held, NARRATION_PAUSE_PARAGRAPH
+        held = segment
+    if held is not None:
+        yield held, 0.0
 
 def test_voice_system():
-    """Check AivisSpeech Engine operation (optimized for fast startup)"""
+    """
+    Check AivisSpeech Engine operation (optimized for fast startup)
+    v4.2: A /version liveness probe; speaker models are warmed up in the
+    background (start_speaker_warmup) instead of by a test synthesis.
+    """
     import io
     
     test_text = "音声システム動作確認です"
     
     try:
-        query_response = requests.post(
-            f"{AIVIS_BASE_URL}/audio_query?speaker={AIVIS_SPEAKER_ID}&text={test_text}",
-            timeout=5
-        )
+        version = _engine.version()
+
+        # Only play test sound if DEBUG_TEST_VOICE is True
+        if not DEBUG_TEST_VOICE:
+            logger.info(f"AivisSpeech Engine {version} is running (silent check)")
+            return True
+
+        negotiate_audio_format()
+        audio_query = _engine.audio_query(test_text, AIVIS_SPEAKER_ID)
+        audio_query['speedScale'] = 1.1
+        audio_query['outputSamplingRate'] = _output_format['rate']
+        audio_query['outputStereo'] = _output_format['stereo']
         
-        if query_response.status_code != 200:
-            return False
+        wav = _engine.synthesis(audio_query, AIVIS_SPEAKER_ID)
         
-        audio_query = query_response.json()
-        audio_query['speedScale'] = 1.1
+        audio_data = io.BytesIO(wav)
+        sound = pygame.mixer.Sound(audio_data)
+        channel = sound.play()
         
-        response = requests.post(
-            f"{AIVIS_BASE_URL}/synthesis?speaker={AIVIS_SPEAKER_ID}",
-            json=audio_query,
-            timeout=10
-        )
+        if channel:
+            while channel.get_busy():
+                pygame.time.wait(10)
         
-        if response.status_code == 200:
-            # Only play test sound if DEBUG_TEST_VOICE is True
-            if DEBUG_TEST_VOICE:
-                pygame.mixer.init(frequency=24000, size=-16, channels=1)
-                audio_data = io.BytesIO(response.content)
-                sound = pygame.mixer.Sound(audio_data)
-                channel = sound.play()
-                
-                if channel:
-                    while channel.get_busy():
-                        pygame.time.wait(10)
-                
-                logger.info("AivisSpeech Engine is running (with test voice)")
-            else:
-                logger.info("AivisSpeech Engine is running (silent check)")
-            
-            return True
+        logger.info(f"AivisSpeech Engine {version} is running (with test voice)")
+        return True
             
     except Exception as e:
         logger.error(f"Voice test error: {e}")
         return False
 
+# ===============================
+# Transcript tailing (v4.2)
+# ===============================
+class _TranscriptEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for the followed transcript"""
+
+    def __init__(self, watcher):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event):
+        self._watcher._on_event(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self._watcher._on_event(dest_path)
+
+
+class TranscriptWatcher:
+    """
+    Wait for the followed transcript to change (v4.2)
+    With watchdog (inotify / ReadDirectoryChangesW / FSEvents) the monitor
+    wakes as soon as the file is written and sleeps otherwise. Without it,
+    os.stat is polled from TAIL_POLL_MIN_INTERVAL, backing off exponentially
+    to TAIL_POLL_MAX_INTERVAL while the file is idle.
+    """
+
+    def __init__(self, use_watchdog=TAIL_USE_WATCHDOG):
+        self._changed = threading.Event()
+        self._path = None
+        self._watch = None
+        self._last_stat = None
+        self._interval = TAIL_POLL_MIN_INTERVAL
+        self._observer = None
+        if use_watchdog and Observer is not None:
+            try:
+                observer = Observer()
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+            except Exception as e:
+                logger.warning(f"[Tail] watchdog unavailable, polling instead: {e}")
+        logger.info(f"[Tail] Backend: {self.backend}")
+
+    @property
+    def backend(self):
+        return 'watchdog' if self._observer else 'stat polling'
+
+    def follow(self, path):
+        """Watch path instead of the previously followed file"""
+        self._path = os.path.abspath(path)
+        self._last_stat = None
+        self._interval = TAIL_POLL_MIN_INTERVAL
+        self._changed.set()  # Read once right away
+        if self._observer:
+            if self._watch is not None:
+                self._observer.unschedule(self._watch)
+                self._watch = None
+            try:
+                self._watch = self._observer.schedule(
+                    _TranscriptEventHandler(self), os.path.dirname(self._path), recursive=False
+                )
+            except Exception as e:
+                logger.warning(f"[Tail] Cannot watch {os.path.dirname(self._path)}: {e}")
+
+    def _on_event(self, path):
+        if self._path and os.path.abspath(path) == self._path:
+            self._changed.set()
+
+    def _stat(self):
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def wait(self, timeout):
+        """Block until the file changes or timeout passes; True if it changed"""
+        if self._observer and self._watch is not None:
+            changed = self._changed.wait(timeout)
+            self._changed.clear()
+            return changed
+
+        deadline = time.time() + timeout
+        while not _stop_flag.is_set():
+            if self._changed.is_set():
+                self._changed.clear()
+                return True
+            current = self._stat()
+            if current != self._last_stat:
+                self._last_stat = current
+                self._interval = TAIL_POLL_MIN_INTERVAL
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+            self._interval = min(self._interval * 2, TAIL_POLL_MAX_INTERVAL)
+        return False
+
+    def close(self):
+        if self._observer:
+            self._observer.stop()
+
+# v4.2: Raw-bytes prefilter. Only these records can produce narration; the rest
+# (tool results without a denial, summaries, snapshots, system records) are
+# skipped without json.loads or generate_message_id.
+_ASSISTANT_RECORD_RE = re.compile(rb'"role"\s*:\s*"assistant"')
+_ENQUEUE_RECORD_RE = re.compile(rb'"operation"\s*:\s*"enqueue"')
+_TOOL_RESULT_MARKER = b'"tool_result"'
+_DENIAL_MARKER = b"doesn't want to proceed"
+_REJECTED_MARKER = b'rejected'  # Matched case-insensitively
+
+def is_narratable_line(raw_line):
+    """Cheap check on the raw bytes: could this transcript line be narrated?"""
+    if _ASSISTANT_RECORD_RE.search(raw_line) or _ENQUEUE_RECORD_RE.search(raw_line):
+        return True
+    # Tool results only matter when they carry a permission denial
+    if _TOOL_RESULT_MARKER not in raw_line:
+        return False
+    # bytes.lower() is far faster than an IGNORECASE regex, which has no literal prefix to skip ahead with
+    return _DENIAL_MARKER in raw_line or _REJECTED_MARKER in raw_line.lower()
+
+class _OversizedLine:
+    """
+    Constant-memory summary of a transcript line over TAIL_MAX_LINE_BYTES (v4.2)
+    The line is never held whole: each chunk is hashed for the duplicate
+    check and scanned for the prefilter markers, then dropped.
+    """
+
+    _OVERLAP = 64  # bytes carried between chunks so a marker split across reads still matches
+
+    def __init__(self):
+        self.size = 0
+        self.assistant = False
+        self.tool_result = False
+        self.denied = False
+        self._digest = hashlib.md5()
+        self._carry = b''
+
+    def feed(self, buf, start, end):
+        """Account for buf[start:end], the next piece of the line"""
+        self.size += end - start
+        self._digest.update(memoryview(buf)[start:end])
+        head = self._carry + buf[start:min(end, start + self._OVERLAP)]
+        self._scan(head, 0, len(head))
+        self._scan(buf, start, end)
+        if end - start >= self._OVERLAP:
+            self._carry = buf[end - self._OVERLAP:end]
+        else:
+            self._carry = head[-self._OVERLAP:]
+
+    def _scan(self, buf, start, end):
+        if not self.assistant:
+            self.assistant = _ASSISTANT_RECORD_RE.search(buf, start, end) is not None
+        if not self.tool_result:
+            self.tool_result = buf.find(_TOOL_RESULT_MARKER, start, end) != -1
+        if not self.denied:
+            self.denied = (buf.find(_DENIAL_MARKER, start, end) != -1
+                           or _REJECTED_MARKER in buf[start:end].lower())
+
+    @property
+    def message_id(self):
+        return self._digest.hexdigest()[:16]
+
+
+class JsonlTailReader:
+    """
+    Incremental binary reader for an append-only JSONL transcript (v4.2)
+    read_lines() reads the bytes appended since the last call in chunks of
+    TAIL_READ_CHUNK_BYTES, splits them on b'\\n' and returns only complete
+    lines. A line the writer has not finished yet stays buffered until its
+    newline arrives, so it is never parsed (and lost) half-written. Lines
+    longer than TAIL_MAX_LINE_BYTES are streamed through an _OversizedLine
+    instead of being buffered, so memory stays bounded by the chunk size.
+    """
+
+    def __init__(self, path, tail_bytes=TAIL_START_BYTES):
+        self.path = path
+        self._handle = open(path, 'rb')
+        self._pending = b''
+        self._oversized = None
+        size = os.fstat(self._handle.fileno()).st_size
+        start = max(0, size - tail_bytes)
+        if start > 0:
+            # Resume at a line boundary: drop the partial line we landed in
+            self._handle.seek(start - 1)
+            if self._handle.read(1) != b'\n':
+                self._handle.readline()
+        self._position = self._handle.tell()
+
+    def read_lines(self):
+        """
+        Return complete lines appended since the last call
+        Lines are bytes without the newline, or an _OversizedLine for lines
+        over TAIL_MAX_LINE_BYTES. Reading stops after the first chunk that
+        completes a line; the caller keeps calling until this returns [].
+        """
+        size = os.fstat(self._handle.fileno()).st_size
+        if size < self._position:
+            logger.warning(f"[Tail] {os.path.basename(self.path)} truncated, reading from start")
+            self._position = 0
+            self._pending = b''
+            self._oversized = None
+
+        lines = []
+        while not lines and self._position < size:
+            self._handle.seek(self._position)
+            chunk = self._handle.read(min(TAIL_READ_CHUNK_BYTES, size - self._position))
+            if not chunk:
+                break
+            self._position += len(chunk)
+            self._split(chunk, lines)
+        return lines
+
+    def _split(self, chunk, lines):
+        start = 0
+        if self._oversized is not None:
+            end = chunk.find(b'\n')
+            if end == -1:
+                self._oversized.feed(chunk, 0, len(chunk))
+                return
+            self._oversized.feed(chunk, 0, end)
+            lines.append(self._oversized)
+            self._oversized = None
+            start = end + 1
+
+        if self._pending:
+            buf = self._pending + chunk[start:]
+            start = 0
+        else:
+            buf = chunk
+        view = memoryview(buf)
+
+        end = buf.find(b'\n', start)
+        while end != -1:
+            if end - start > TAIL_MAX_LINE_BYTES:
+                oversized = _OversizedLine()
+                oversized.feed(buf, start, end)
+                lines.append(oversized)
+            elif end > start:
+                lines.append(view[start:end].tobytes())
+            start = end + 1
+            end = buf.find(b'\n', start)
+
+        if len(buf) - start > TAIL_MAX_LINE_BYTES:
+            # Too long to buffer: scan the rest of this line as it streams in
+            self._oversized = _OversizedLine()
+            self._oversized.feed(buf, start, len(buf))
+            self._pending = b''
+        else:
+            self._pending = view[start:].tobytes()
+        view.release()
+
+    def close(self):
+        self._handle.close()
+
+_content_repr = reprlib.Repr()  # Bounded repr for message IDs
+_content_repr.maxlevel = 4
+_content_repr.maxstring = 200
+_content_repr.maxother = 200
+
+def _content_prefix(content, limit):
+    """str(content)[:limit] without stringifying a whole tool output (v4.2)"""
+    if isinstance(content, str):
+        return content[:limit]
+    return _content_repr.repr(content)[:limit]
+
+def has_denial_marker(content):
+    """Permission denial in tool_result content, checked string by string (v4.2)"""
+    if isinstance(content, str):
+        return "doesn't want to proceed" in content or 'rejected' in content.lower()
+    if isinstance(content, dict):
+        return any(has_denial_marker(value) for value in content.values())
+    if isinstance(content, list):
+        return any(has_denial_marker(value) for value in content)
+    return False
+
 def generate_message_id(data):
     """Generate unique message ID"""
     key_parts = []
 
     if 'message' in data:
         msg = data['message']
-        content_str = str(msg.get('content', ''))[:100]
+        content_str = _content_prefix(msg.get('content', ''), 100)
         key_parts.append(content_str)
         key_parts.append(msg.get('role', ''))
 
     # queue-operation support
     if data.get('type') == 'queue-operation':
         key_parts.append(data.get('operation', ''))
-        key_parts.append(str(data.get('content', ''))[:50])
+        key_parts.append(_content_prefix(data.get('content', ''), 50))
 
     # Add timestamp if available
     if 'timestamp' in data:
@@ -1023,25 +3323,100 @@ def generate_message_id(data):
     id_str = '_'.join(filter(None, key_parts))
     return hashlib.md5(id_str.encode()).hexdigest()[:16]
 
-def find_latest_jsonl():
-    """Find the latest JSONL file (excludes subagent files)"""
-    patterns = [
-        str(Path.home() / '.claude' / 'projects' / '**' / '*.jsonl'),
-    ]
-
-    all_files = []
-    for pattern in patterns:
-        files = glob(pattern, recursive=True)
-        all_files.extend(files)
+# ===============================
+# Session discovery (v4.2)
+# ===============================
+class SessionIndex:
+    """
+    Incremental index of session transcripts under ~/.claude/projects (v4.2)
+    Remembers every directory's mtime and lists a directory again only when
+    its mtime changes, i.e. when an entry was added or removed. refresh()
+    stats the projects root and the project directories, where new sessions
+    appear; refresh(deep=True) also stats the deeper directories. Subagent
+    transcripts are never indexed.
+    """
 
-    # Exclude subagent JSONL files to avoid duplicate reading
-    all_files = [f for f in all_files if 'subagents' not in f]
+    def __init__(self, root=None):
+        self.root = str(root or Path.home() / '.claude' / 'projects')
+        self._dirs = {self.root: (0, None)}  # path -> (depth, mtime_ns when listed)
+        self._top_dirs = {self.root}  # Root and project directories, checked on every refresh
+        self._children = {}  # directory -> entries indexed from it
+        self._files = {}  # session file -> mtime when discovered
+        self.directory_scans = 0
+        self.refresh(deep=True)
+
+    def __len__(self):
+        return len(self._files)
+
+    def refresh(self, deep=False):
+        """Rescan directories whose mtime changed; return newly seen session files"""
+        new_files = []
+        for path in list(self._dirs if deep else self._top_dirs):
+            if path not in self._dirs:
+                continue  # Removed while rescanning its parent
+            depth, listed_mtime = self._dirs[path]
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != listed_mtime:
+                self._scan(path, depth, mtime, new_files)
+        return new_files
+
+    def _scan(self, path, depth, mtime, new_files):
+        self._dirs[path] = (depth, mtime)
+        if depth <= 1:
+            self._top_dirs.add(path)
+        self.directory_scans += 1
+        entries = set()
+        if mtime is not None:
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        # Same files as glob('**/*.jsonl') minus subagents
+                        if entry.name.startswith('.') or 'subagents' in entry.name:
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                entries.add(entry.path)
+                                if entry.path not in self._dirs:
+                                    self._scan(entry.path, depth + 1, entry.stat().st_mtime_ns, new_files)
+                            elif entry.name.endswith('.jsonl'):
+                                entries.add(entry.path)
+                                if entry.path not in self._files:
+                                    self._files[entry.path] = entry.stat().st_mtime
+                                    new_files.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug(f"[Sessions] Cannot list {path}: {e}")
+        for gone in self._children.get(path, set()) - entries:
+            self._forget(gone)
+        self._children[path] = entries
+
+    def _forget(self, path):
+        self._files.pop(path, None)
+        self._top_dirs.discard(path)
+        if self._dirs.pop(path, None) is not None:
+            for child in self._children.pop(path, set()):
+                self._forget(child)
+
+    def latest(self):
+        """Session file with the newest mtime as of its discovery, or None"""
+        if not self._files:
+            return None
+        return max(self._files, key=self._files.get)
+
+def find_latest_jsonl(index=None):
+    """Find the latest JSONL file (excludes subagent files)"""
+    if index is None:
+        index = SessionIndex()
 
-    if not all_files:
+    latest = index.latest()
+    if not latest:
         logger.error("JSONL file not found")
         return None
 
-    latest = max(all_files, key=lambda x: os.path.getmtime(x))
     logger.info(f"Found JSONL: {latest}")
     return latest
 
@@ -1064,6 +3439,117 @@ def skip_initial_messages(file_handle, skip_count=0):
         logger.info(f"[Monitor] Skipped {skipped_count} initial messages")
     return skipped_count
 
+def process_oversized_line(line):
+    """Handle a line too long to parse, using only its _OversizedLine summary (v4.2)"""
+    if line.tool_result and line.denied and not line.assistant:
+        if line.message_id in _processed_messages:
+            return
+        _processed_messages.append(line.message_id)
+        logger.info("[Permission] User denied tool use")
+        enqueue_speech_simple(NARRATION_PERMISSION_DENIED, speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
+    elif line.assistant:
+        logger.warning(f"[Tail] Skipped {line.size / 1e6:.1f} MB assistant message (over TAIL_MAX_LINE_BYTES)")
+    else:
+        logger.debug(f"[Tail] Skipped {line.size / 1e6:.1f} MB line")
+
+def process_transcript_line(raw_line):
+    """Parse one complete transcript line and enqueue its narration (v4.2)"""
+    if isinstance(raw_line, _OversizedLine):
+        process_oversized_line(raw_line)
+        return
+    if not is_narratable_line(raw_line):
+        return
+
+    # JSON parsing and processing (only complete lines reach here)
+    data = json.loads(raw_line.decode('utf-8', errors='ignore'))
+
+    # Duplicate check
+    msg_id = generate_message_id(data)
+    if msg_id in _processed_messages:
+        return
+
+    _processed_messages.append(msg_id)
+
+    # --- v4.0: User input confirmation ---
+    if data.get('type') == 'queue-operation' and data.get('operation') == 'enqueue':
+        user_content = data.get('content', '')
+        if user_content and isinstance(user_content, str) and not user_content.startswith('<'):
+            logger.info("[UserInput] User message received")
+            enqueue_speech_simple(NARRATION_USER_INPUT, speed=NARRATION_SPEED_NORMAL, volume=VOLUME_THINKING)
+        return
+
+    # Process assistant and user messages
+    if 'message' in data:
+        msg = data['message']
+
+        # --- v4.0: User role - detect human input & permission responses ---
+        if msg.get('role') == 'user':
+            content = msg.get('content', '')
+
+            # Human-typed message (string content, not tool_result)
+            if isinstance(content, str) and len(content) > 3:
+                # Already handled by queue-operation above
+                pass
+
+            # Tool results - check for permission denied
+            if isinstance(content, list):
+                for item in content:
+                    if isinstance(item, dict) and item.get('type') == 'tool_result':
+                        if has_denial_marker(item.get('content', '')):
+                            logger.info("[Permission] User denied tool use")
+                            enqueue_speech_simple(NARRATION_PERMISSION_DENIED, speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
+            return
+
+        # --- Assistant messages ---
+        if msg.get('role') == 'assistant':
+            content = msg.get('content', [])
+
+            logger.info("[Assistant] Response detected")
+
+            full_text = ""
+            for item in content:
+                if isinstance(item, dict):
+                    text = item.get('text', '')
+                    if text:
+                        full_text += text
+
+            # Check for thinking content
+            thinking_text = ""
+            for item in content:
+                if isinstance(item, dict):
+                    if item.get('type') == 'thinking':
+                        thinking = item.get('thinking', '')
+                        if thinking:
+                            thinking_text += thinking
+
+            # Process thinking if found
+            if thinking_text.strip():
+                thinking_narration = process_thinking_for_narration(thinking_text)
+                if thinking_narration:
+                    logger.info(f"[Thinking] {len(thinking_narration)} chars")
+                    enqueue_speech_simple(thinking_narration, speed=NARRATION_SPEED_THINKING, volume=VOLUME_THINKING)
+
+            # v4.0: Tool use narration with permission awareness
+            for item in content:
+                if isinstance(item, dict) and item.get('type') == 'tool_use':
+                    tool_narration = process_tool_use_for_narration(
+                        item.get('name', ''),
+                        item.get('input', {})
+                    )
+                    if tool_narration:
+                        logger.info(f"[ToolUse] {item.get('name', '')}: {tool_narration}")
+                        enqueue_speech_simple(tool_narration, speed=NARRATION_SPEED_THINKING, volume=VOLUME_THINKING)
+
+            # Process regular text
+            # v4.2: Enqueue each paragraph as soon as it is normalized
+            if full_text.strip():
+                narration_chars = 0
+                for segment, pause in iter_narration_segments(full_text):
+                    narration_chars += len(segment)
+                    enqueue_speech_simple(segment, speed=NARRATION_SPEED_NORMAL,
+                                          volume=VOLUME_NORMAL, pause_after=pause)
+                logger.info(f"[Assistant] Full text: {narration_chars} chars")
+
 def monitor_and_speak():
     """
     Dynamic file switching supported version (v3.2.0)
@@ -1076,35 +3562,28 @@ def monitor_and_speak():
     if _speech_thread is None or not _speech_thread.is_alive():
         _stop_flag.clear()
         _speech_thread = threading.Thread(
-            target=speech_worker_simple,
+            target=_speech_worker_target(),
             daemon=True
         )
         _speech_thread.start()
     
     # State management variables
     current_file = None
-    current_handle = None
+    current_reader = None  # v4.2: JsonlTailReader (binary, buffers partial lines)
     last_check = 0
-    file_position = 0  # Track file position for proper tail behavior
-    known_files = set()  # Track known JSONL files to detect truly new sessions
+    last_sweep = 0
+    session_index = SessionIndex()  # v4.2: Only rescans directories whose mtime changed
     
     # Initial file selection
-    current_file = find_latest_jsonl()
+    current_file = find_latest_jsonl(session_index)
     if not current_file:
         logger.error("No JSONL file found at startup")
         return
-    
-    # Initialize known files with all existing files (exclude subagents)
-    patterns = [
-        str(Path.home() / '.claude' / 'projects' / '**' / '*.jsonl'),
-    ]
-    for pattern in patterns:
-        files = glob(pattern, recursive=True)
-        known_files.update(f for f in files if 'subagents' not in f)
+    watcher = TranscriptWatcher()  # v4.2: Wakes the loop when the transcript grows
     
     logger.info(f"[Monitor] Initial file: {os.path.basename(current_file)}")
-    logger.info(f"[Monitor] Tracking {len(known_files)} existing JSONL files")
-    logger.info(f"[Monitor] Check interval: {CHECK_INTERVAL} seconds")
+    logger.info(f"[Monitor] Tracking {len(session_index)} existing JSONL files")
+    logger.info(f"[Monitor] Check interval: {SESSION_SCAN_INTERVAL} seconds (full sweep every {CHECK_INTERVAL} seconds)")
     logger.info(f"[Monitor] Auto session detection: ENABLED")
     logger.info("="*70)
     logger.info("Claude AIVIS Aloud v3.2.3")
@@ -1120,45 +3599,30 @@ def monitor_and_speak():
         while not _stop_flag.is_set():
             # Periodic new session check (v3.2.0: only detect truly new files)
             now = time.time()
-            if now - last_check > CHECK_INTERVAL:
-                # Find all current JSONL files (exclude subagents)
-                patterns = [
-                    str(Path.home() / '.claude' / 'projects' / '**' / '*.jsonl'),
-                ]
-                all_current_files = set()
-                for pattern in patterns:
-                    files = glob(pattern, recursive=True)
-                    all_current_files.update(f for f in files if 'subagents' not in f)
-                
-                # Check for truly new files (not in known_files)
-                new_files = all_current_files - known_files
+            if now - last_check > SESSION_SCAN_INTERVAL:
+                # Only files created since startup count as new sessions
+                deep = now - last_sweep > CHECK_INTERVAL
+                new_files = session_index.refresh(deep=deep)
+                if deep:
+                    last_sweep = now
                 
                 if new_files:
                     # New session detected - switch to the newest file
                     latest_file = max(new_files, key=lambda x: os.path.getctime(x) if os.path.exists(x) else 0)
-                    known_files.update(new_files)  # Add new files to known set
                     
                     logger.info(f"[NEW SESSION] {os.path.basename(latest_file)} detected")
                     logger.info(f"[SESSION SWITCH] {os.path.basename(current_file) if current_file else 'None'} -> {os.path.basename(latest_file)}")
                     
-                    # 1. Close old handle
-                    if current_handle:
-                        current_handle.close()
+                    # 1. Close old reader
+                    if current_reader:
+                        current_reader.close()
                         logger.debug("Closed old file handle")
                     
                     # 2. Open new file
+                    # 3. Start from last 10KB for context (v3.2.0: proper tail -f behavior)
                     current_file = latest_file
-                    current_handle = open(current_file, 'r', encoding='utf-8', errors='ignore')
-                    
-                    # 3. Set start position (v3.2.0: proper tail -f behavior)
-                    # Start from last 10KB for context, but avoid duplicates
-                    current_handle.seek(0, 2)
-                    file_size = current_handle.tell()
-                    start_pos = max(0, file_size - 10240)  # Last 10KB
-                    current_handle.seek(start_pos)
-                    if start_pos > 0:
-                        current_handle.readline()  # Skip partial line
-                    file_position = current_handle.tell()
+                    current_reader = JsonlTailReader(current_file)
+                    watcher.follow(current_file)
                     
                     # 4. Clear processed message IDs
                     _processed_messages.clear()
@@ -1168,7 +3632,7 @@ def monitor_and_speak():
                     # skip_initial_messages(current_handle)  # Disabled to avoid missing messages
                     
                     # 6. Voice notification with clear announcement
-                    enqueue_speech_simple("新しいセッションが始まりました。", speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
+                    enqueue_speech_simple(NARRATION_NEW_SESSION, speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
                     
                     logger.info(f"[Monitor] Now monitoring: {os.path.basename(current_file)}")
                 
@@ -1177,152 +3641,47 @@ def monitor_and_speak():
             # Handle file deletion
             if current_file and not os.path.exists(current_file):
                 logger.warning(f"[Monitor] File deleted: {os.path.basename(current_file)}")
-                if current_handle:
-                    current_handle.close()
-                current_handle = None
+                if current_reader:
+                    current_reader.close()
+                current_reader = None
                 current_file = None
                 _processed_messages.clear()
                 continue
             
             # Handle uninitialized file handle
-            if not current_handle and current_file:
-                current_handle = open(current_file, 'r', encoding='utf-8', errors='ignore')
-                
-                # Set start position (v3.2.0: proper tail -f behavior)
-                # Start from last 10KB for initial context
-                current_handle.seek(0, 2)
-                file_size = current_handle.tell()
-                start_pos = max(0, file_size - 10240)  # Last 10KB
-                current_handle.seek(start_pos)
-                if start_pos > 0:
-                    current_handle.readline()  # Skip partial line
-                file_position = current_handle.tell()
+            if not current_reader and current_file:
+                # Start from last 10KB for initial context (v3.2.0: proper tail -f behavior)
+                current_reader = JsonlTailReader(current_file)
+                watcher.follow(current_file)
                 
                 # Skip initial messages (v3.1.8: skip only on initial startup)
                 # skip_initial_messages(current_handle)  # Disabled to avoid missing messages
                 
                 logger.info(f"[Monitor] Opened file: {os.path.basename(current_file)}")
             
-            # Normal read processing (v3.2.0: improved for Windows)
-            if current_handle:
+            # Normal read processing (v4.2: every complete line appended since the last read)
+            if current_reader:
                 try:
-                    # Check if file has grown (new data available)
-                    current_handle.seek(0, 2)  # Go to end
-                    end_position = current_handle.tell()
-                    
-                    if end_position > file_position:
-                        # New data available, go back to last read position
-                        current_handle.seek(file_position)
-                    else:
-                        # No new data
-                        time.sleep(0.05)  # Reduce CPU load
-                        continue
-                    
-                    line = current_handle.readline()
-                    
-                    if not line:
-                        time.sleep(0.05)  # Reduce CPU load
-                        continue
-                    
-                    # Update position after successful read
-                    file_position = current_handle.tell()
-                    
-                    # JSON parsing and processing
-                    data = json.loads(line)
-                    
-                    # Duplicate check
-                    msg_id = generate_message_id(data)
-                    if msg_id in _processed_messages:
-                        continue
-                    
-                    _processed_messages.append(msg_id)
-
-                    # --- v4.0: User input confirmation ---
-                    if data.get('type') == 'queue-operation' and data.get('operation') == 'enqueue':
-                        user_content = data.get('content', '')
-                        if user_content and isinstance(user_content, str) and not user_content.startswith('<'):
-                            logger.info("[UserInput] User message received")
-                            enqueue_speech_simple("受け取りました。", speed=NARRATION_SPEED_NORMAL, volume=VOLUME_THINKING)
-                        continue
-
-                    # Process assistant and user messages
-                    if 'message' in data:
-                        msg = data['message']
-
-                        # --- v4.0: User role - detect human input & permission responses ---
-                        if msg.get('role') == 'user':
-                            content = msg.get('content', '')
-
-                            # Human-typed message (string content, not tool_result)
-                            if isinstance(content, str) and len(content) > 3:
-                                # Already handled by queue-operation above
-                                pass
-
-                            # Tool results - check for permission denied
-                            if isinstance(content, list):
-                                for item in content:
-                                    if isinstance(item, dict) and item.get('type') == 'tool_result':
-                                        result_text = str(item.get('content', ''))
-                                        if "doesn't want to proceed" in result_text or 'rejected' in result_text.lower():
-                                            logger.info("[Permission] User denied tool use")
-                                            enqueue_speech_simple("ユーザーが操作を拒否しました。", speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
-                            continue
-
-                        # --- Assistant messages ---
-                        if msg.get('role') == 'assistant':
-                            content = msg.get('content', [])
-
-                            logger.info("[Assistant] Response detected")
-
-                            full_text = ""
-                            for item in content:
-                                if isinstance(item, dict):
-                                    text = item.get('text', '')
-                                    if text:
-                                        full_text += text
-
-                            # Check for thinking content
-                            thinking_text = ""
-                            for item in content:
-                                if isinstance(item, dict):
-                                    if item.get('type') == 'thinking':
-                                        thinking = item.get('thinking', '')
-                                        if thinking:
-                                            thinking_text += thinking
-
-                            # Process thinking if found
-                            if thinking_text.strip():
-                                thinking_narration = process_thinking_for_narration(thinking_text)
-                                if thinking_narration:
-                                    logger.info(f"[Thinking] {len(thinking_narration)} chars")
-                                    enqueue_speech_simple(thinking_narration, speed=NARRATION_SPEED_THINKING, volume=VOLUME_THINKING)
-
-                            # v4.0: Tool use narration with permission awareness
-                            for item in content:
-                                if isinstance(item, dict) and item.get('type') == 'tool_use':
-                                    tool_narration = process_tool_use_for_narration(
-                                        item.get('name', ''),
-                                        item.get('input', {})
-                                    )
-                                    if tool_narration:
-                                        logger.info(f"[ToolUse] {item.get('name', '')}: {tool_narration}")
-                                        enqueue_speech_simple(tool_narration, speed=NARRATION_SPEED_THINKING, volume=VOLUME_THINKING)
-
-                            # Process regular text
-                            if full_text.strip():
-                                narration_text = process_text_for_narration(full_text)
-                                logger.info(f"[Assistant] Full text: {len(narration_text)} chars")
-
-                                enqueue_speech_simple(narration_text, speed=NARRATION_SPEED_NORMAL, volume=VOLUME_NORMAL)
-                    
-                except json.JSONDecodeError:
-                    pass  # Ignore incomplete JSON
-                except Exception as e:
-                    if "Expecting value" not in str(e):
-                        logger.error(f"[Monitor] Processing error: {e}")
+                    lines = current_reader.read_lines()
+                except OSError as e:
+                    logger.error(f"[Monitor] Read error: {e}")
+                    lines = []
+                if not lines:
+                    # No new complete line: sleep until the file changes or the next session check
+                    watcher.wait(max(0.0, SESSION_SCAN_INTERVAL - (time.time() - last_check)))
+                    continue
+
+                for raw_line in lines:
+                    try:
+                        process_transcript_line(raw_line)
+                    except json.JSONDecodeError:
+                        pass  # Ignore malformed JSON
+                    except Exception as e:
+                        if "Expecting value" not in str(e):
+                            logger.error(f"[Monitor] Processing error: {e}")
             else:
                 # Wait a bit if no file handle
-                time.sleep(1.0)
+                time.sleep(SESSION_SCAN_INTERVAL)
     
     except KeyboardInterrupt:
         logger.info("\n[Monitor] Stopping by user request...")
@@ -1330,9 +3689,10 @@ def monitor_and_speak():
         logger.error(f"[Monitor] Unexpected error: {e}", exc_info=True)
     finally:
         # Cleanup
-        if current_handle:
-            current_handle.close()
+        if current_reader:
+            current_reader.close()
             logger.debug("Closed file handle in cleanup")
+        watcher.close()
         _stop_flag.set()
         
         # Termination signal
@@ -1341,12 +3701,23 @@ def monitor_and_speak():
         if _speech_thread and _speech_thread.is_alive():
             _speech_thread.join(timeout=5)
         
+        _audio_cache.log_stats()
+        _audio_query_cache.log_stats()
+        for memo in (_narration_memo, _thinking_memo, _chunk_memo):
+            memo.log_stats()
+        _engine.log_stats()
         logger.info("[Monitor] Monitor stopped")
 
 def main():
     """Main entry point"""
-    global _start_time
+    global _start_time, PIPELINE_MODE
     _start_time = time.time()
+
+    parser = argparse.ArgumentParser(description="Claude AIVIS Aloud")
+    parser.add_argument('--pipeline', choices=['thread', 'async'], default=PIPELINE_MODE,
+                        help="Speech pipeline implementation (default: %(default)s)")
+    args, _ = parser.parse_known_args()
+    PIPELINE_MODE = args.pipeline
     
     # Set up signal handlers
     signal.signal(signal.SIGTERM, signal_handler)
@@ -1360,6 +3731,7 @@ def main():
     print("Claude AIVIS Aloud v3.2.3")
     print("Optimized for fast startup and timeout prevention")
     print(f"Voice test: {'Enabled' if DEBUG_TEST_VOICE else 'Silent mode (faster startup)'}")
+    print(f"Speech pipeline: {PIPELINE_MODE}")
     print("="*70)
     
     # Cleanup duplicate processes
@@ -1379,6 +3751,19 @@ def main():
         return
     
     print("[OK] AivisSpeech Engine is running")
+
+    output_format = negotiate_audio_format()
+    print(f"[OK] Audio output: {output_format['rate']}Hz "
+          f"{'stereo' if output_format['stereo'] else 'mono'}")
+
+    if open_audio_store():
+        print("[OK] Persistent audio store opened")
+
+    # Load speaker models without blocking startup
+    start_speaker_warmup()
+
+    # Pre-render tool/thinking narration so it plays without engine calls
+    start_phrase_bank_prerender()
     
     print("\n4. Starting the monitoring system...")
     print("Features:")
@@ -14,6 +14,9 @@ import requests
 import json
 import sys
 
+# Keep-alive session shared by all engine calls in this script
+_session = requests.Session()
+
 
 def list_available_speakers():
     """利用可能な話者を一覧表示"""
@@ -25,7 +28,7 @@ def list_available_speakers():
         print("AIVIS Speech Engineに接続中...")
         
         # 話者一覧を取得
-        response = requests.get(f"{engine_url}/speakers", timeout=5)
+        response = _session.get(f"{engine_url}/speakers", timeout=5)
         response.raise_for_status()
         
         speakers = response.json()
@@ -112,7 +115,7 @@ def check_engine_status():
     engine_url = "http://localhost:10101"
     
     try:
-        response = requests.get(f"{engine_url}/version", timeout=2)
+        response = _session.get(f"{engine_url}/version", timeout=2)
         if response.status_code == 200:
             version_info = response.json()
             print(f"✅ AIVIS Speech Engine バージョン: {version_info}")
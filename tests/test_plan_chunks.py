@@ -0,0 +1,95 @@
+"""Properties of plan_chunks, the splitter used for every synthesis request"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import claude_aivis_aloud as aloud  # noqa: E402
+
+PIECES = ['今日は良い天気です', '設定を変更しました', 'テスト', 'Hello world', 'e.g', 'v4.2',
+          '。', '。。', '、', '，', ',', '！', '？', '!', '?', '.', '. ', '\n', '\n\n', ' ', '　']
+
+
+def random_text(rng, max_pieces):
+    parts = []
+    for _ in range(rng.randint(1, max_pieces)):
+        if rng.random() < 0.05:
+            parts.append('長' * rng.randint(1, 1200))  # No break at all
+        else:
+            parts.append(rng.choice(PIECES))
+    return ''.join(parts)
+
+
+def _no_space(text):
+    return re.sub(r'\s', '', text)
+
+
+@pytest.fixture(autouse=True)
+def default_growth(monkeypatch):
+    monkeypatch.setattr(aloud, '_synthesis_rtf', None)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_texts(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = random_text(rng, rng.choice((5, 50, 500)))
+        max_length = rng.choice((1, 2, 10, 40, aloud.AIVIS_OPTIMAL_LENGTH, aloud.AIVIS_MAX_LENGTH, 2000))
+        first_length = rng.choice((1, 10, aloud.FIRST_CHUNK_MAX_LENGTH, 500))
+        limit = min(max_length, aloud.AIVIS_MAX_LENGTH)
+        chunks = aloud.plan_chunks(text, first_length, max_length)
+        if len(chunks) == 1 and chunks[0] == text:
+            assert len(text) <= limit
+            continue
+        assert all(len(chunk) <= limit for chunk in chunks)
+        assert all(chunk.strip() for chunk in chunks)
+        assert _no_space(''.join(chunks)) == _no_space(text)
+
+
+def test_chunks_are_slices_in_order():
+    text = '最初の文です。' + 'line of output\n' * 100 + 'The end. Really.'
+    chunks = aloud.plan_chunks(text)
+    assert ''.join(chunks) == text
+
+
+def test_first_chunk_is_short():
+    text = '設定ファイルを読み込みました。' * 20
+    chunks = aloud.plan_chunks(text)
+    assert len(chunks[0]) <= aloud.FIRST_CHUNK_MAX_LENGTH
+    assert chunks[0].endswith('。')
+
+
+def test_later_chunks_grow_up_to_max_length():
+    text = '設定を確認しました。' * 200
+    lengths = [len(chunk) for chunk in aloud.plan_chunks(text)]
+    assert lengths[1] > lengths[0]
+    assert max(lengths) <= aloud.AIVIS_OPTIMAL_LENGTH
+
+
+def test_breaks_on_newlines_and_ascii_periods():
+    for text in ['line of output\n' * 100, 'The build passed. All tests are green. ' * 50]:
+        for chunk in aloud.plan_chunks(text)[:-1]:
+            assert chunk.endswith(('\n', '. '))
+
+
+def test_falls_back_to_commas():
+    text = '項目、' * 400 + '。'
+    for chunk in aloud.plan_chunks(text)[:-1]:
+        assert chunk.endswith('、')
+
+
+def test_long_clause_runs_on_to_its_end():
+    clause = 'とても長い説明' * 10 + '。'
+    chunks = aloud.plan_chunks(clause + '次の文です。' * 20)
+    assert chunks[0] == clause
+
+
+def test_unbreakable_text_is_hard_split():
+    chunks = aloud.plan_chunks('長' * 1200)
+    assert all(len(chunk) <= aloud.AIVIS_OPTIMAL_LENGTH for chunk in chunks)
+    assert ''.join(chunks) == '長' * 1200